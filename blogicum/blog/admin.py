@@ -1,18 +1,28 @@
 from django.contrib import admin
+from django.db.models import Q
 from django.utils.safestring import mark_safe
 
+from .images import get_variant
 from .models import Category, Location, Post, Comments
+from .paginators import CachedCountPaginator
+from .search import matching_posts, query_terms
 
 
 class AdminPost(admin.ModelAdmin):
     list_display = (
         'title',
         'is_published',
+        'is_visible',
         'pub_date',
         'author',
         'category',
         'location',
     )
+    list_select_related = (
+        'author',
+        'category',
+        'location',
+    )
     empty_value_display = 'Не задано'
     save_on_top = True
     list_editable = (
@@ -20,18 +30,50 @@ class AdminPost(admin.ModelAdmin):
     )
     list_filter = [
         'is_published',
-        'pub_date',
+        'is_visible',
     ]
+    date_hierarchy = 'pub_date'
+    raw_id_fields = (
+        'author',
+    )
+    autocomplete_fields = (
+        'category',
+        'location',
+    )
+    # Без COUNT(*) по всей таблице при поиске и фильтрах.
+    show_full_result_count = False
+    paginator = CachedCountPaginator
+    # Заголовок и текст ищутся по поисковому индексу, остальные поля —
+    # точным совпадением (см. get_search_results).
     search_fields = [
         'title',
-        'author__username',
-        'location__name',
-        'category__title',
+        'text',
+        '=author__username',
+        '=category__slug',
+        '=category__title',
+        '=location__name',
     ]
     readonly_fields = ["preview"]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Индекс и точные совпадения вместо LIKE-запросов по search_fields.
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        condition = (Q(author__username=term)
+                     | Q(category__slug=term)
+                     | Q(category__title=term)
+                     | Q(location__name=term))
+        terms = query_terms(term)
+        if terms:
+            condition |= Q(pk__in=matching_posts(terms))
+        return queryset.filter(condition), False
+
     def preview(self, obj):
-        return mark_safe(f'<img src="{obj.image.url}"'
+        if not obj.image:
+            return ''
+        image = get_variant(obj.image, 'admin')
+        return mark_safe(f'<img src="{image.url}"'
                          'style="max-height: 200px;">')
 
 
@@ -48,6 +90,10 @@ class CategoryAdmin(admin.ModelAdmin):
         'title',
         'is_published',
     ]
+    search_fields = [
+        'title',
+        'slug',
+    ]
 
 
 class LocationAdmin(admin.ModelAdmin):
@@ -61,6 +107,9 @@ class LocationAdmin(admin.ModelAdmin):
     list_filter = [
         'is_published',
     ]
+    search_fields = [
+        'name',
+    ]
 
 
 class CommentsAdmin(admin.ModelAdmin):
@@ -69,9 +118,16 @@ class CommentsAdmin(admin.ModelAdmin):
         'author',
         'post',
     )
-    list_filter = [
-        'created_at',
-    ]
+    list_select_related = (
+        'author',
+        'post',
+    )
+    date_hierarchy = 'created_at'
+    raw_id_fields = (
+        'author',
+        'post',
+    )
+    show_full_result_count = False
 
 
 admin.site.register(Post, AdminPost)
@@ -0,0 +1,162 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.utils import load_backend
+from django.utils import timezone
+from PIL import Image
+
+from .models import Category, Comments, Location, Post, User
+
+BENCH_PREFIX = 'bench'
+VOCABULARY = [f'слово{i}' for i in range(5_000)]
+
+
+def add_database_argument(parser):
+    parser.add_argument('--database',
+                        required=True,
+                        help='Алиас отдельной базы для замеров из'
+                             ' DATABASES; default и реплики запрещены.')
+
+
+@contextmanager
+def bench_database(alias):
+    """Подменяет default базой alias, а кэш — пустым кэшем в памяти.
+
+    Как при прогоне тестов: всё, что бенчмарк создаёт, меняет и
+    сбрасывает, остаётся в отдельной базе и не трогает рабочий кэш.
+    """
+    if alias not in connections.databases:
+        raise CommandError(f'Нет базы с алиасом {alias!r}')
+    target = connections[alias].settings_dict
+    protected = [connections[name].settings_dict['NAME']
+                 for name in (DEFAULT_DB_ALIAS,
+                              *settings.BLOG_DATABASE_REPLICAS)]
+    if target['NAME'] in protected:
+        raise CommandError('Бенчмарк заполняет и перестраивает базу:'
+                           ' укажите отдельную базу, а не default или'
+                           ' реплику')
+    primary = connections[DEFAULT_DB_ALIAS]
+    scratch = load_backend(target['ENGINE']).DatabaseWrapper(
+        target, DEFAULT_DB_ALIAS)
+    default_cache = caches[DEFAULT_CACHE_ALIAS]
+    bench_cache = LocMemCache('blog-bench', {})
+    bench_cache.clear()
+    connections[DEFAULT_DB_ALIAS] = scratch
+    caches[DEFAULT_CACHE_ALIAS] = bench_cache
+    # Id типов содержимого в двух базах могут не совпадать.
+    ContentType.objects.clear_cache()
+    try:
+        call_command('migrate', verbosity=0)
+        yield
+    finally:
+        connections[DEFAULT_DB_ALIAS] = primary
+        caches[DEFAULT_CACHE_ALIAS] = default_cache
+        ContentType.objects.clear_cache()
+        scratch.close()
+
+
+def random_text(words):
+    return ' '.join(random.choices(VOCABULARY, k=words))
+
+
+def seed_posts(posts, authors=1_000, categories=100, locations=0,
+               batch_size=10_000, stdout=None):
+    """Дополняет базу синтетическими публикациями до posts штук."""
+    missing = posts - Post.objects.count()
+    if missing <= 0:
+        return
+    User.objects.bulk_create(
+        [User(username=f'{BENCH_PREFIX}{i}') for i in range(authors)],
+        ignore_conflicts=True)
+    Category.objects.bulk_create(
+        [Category(title=f'{BENCH_PREFIX}{i}',
+                  slug=f'{BENCH_PREFIX}{i}',
+                  is_published=bool(i % 10))
+         for i in range(categories)],
+        ignore_conflicts=True)
+    Location.objects.bulk_create(
+        [Location(name=f'{BENCH_PREFIX}{i}') for i in range(locations)])
+    author_ids = list(User.objects
+                      .filter(username__startswith=BENCH_PREFIX)
+                      .values_list('pk', flat=True))
+    category_published = dict(Category.objects
+                              .filter(slug__startswith=BENCH_PREFIX)
+                              .values_list('pk', 'is_published'))
+    category_ids = list(category_published)
+    location_ids = [None] + list(Location.objects
+                                 .filter(name__startswith=BENCH_PREFIX)
+                                 .values_list('pk', flat=True))
+    now = timezone.now()
+
+    def make_post():
+        post = Post(title=random_text(5),
+                    text=random_text(40),
+                    pub_date=now - timedelta(
+                        minutes=random.randint(-10_000, 1_000_000)),
+                    is_published=random.random() > 0.1,
+                    author_id=random.choice(author_ids),
+                    category_id=random.choice(category_ids),
+                    location_id=random.choice(location_ids))
+        # bulk_create обходит сигналы, поэтому видимость задаётся здесь.
+        post.is_visible = (post.is_published
+                           and category_published[post.category_id]
+                           and post.pub_date <= now)
+        return post
+
+    for start in range(0, missing, batch_size):
+        with transaction.atomic():
+            Post.objects.bulk_create(
+                make_post()
+                for _ in range(min(batch_size, missing - start)))
+        if stdout:
+            stdout.write(f'Создано {start + batch_size} из {missing}',
+                         ending='\r')
+    if stdout:
+        stdout.write('')
+
+
+def seed_comments(comments, batch_size=10_000, stdout=None):
+    """Дополняет базу комментариями к случайным публикациям."""
+    missing = comments - Comments.objects.count()
+    if missing <= 0:
+        return
+    author_ids = list(User.objects.values_list('pk', flat=True))
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    for start in range(0, missing, batch_size):
+        with transaction.atomic():
+            Comments.objects.bulk_create(
+                Comments(text=random_text(15),
+                         author_id=random.choice(author_ids),
+                         post_id=random.choice(post_ids))
+                for _ in range(min(batch_size, missing - start)))
+        if stdout:
+            stdout.write(f'Создано {start + batch_size} из {missing}',
+                         ending='\r')
+    if stdout:
+        stdout.write('')
+
+
+def seed_images(images, size=(1600, 1200)):
+    """Прикрепляет одно общее изображение к images публикациям."""
+    name = f'posts_images/{BENCH_PREFIX}.jpg'
+    if not default_storage.exists(name):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'steelblue').save(buffer, 'JPEG')
+        name = default_storage.save(name, ContentFile(buffer.getvalue()))
+    missing = images - Post.objects.exclude(image='').count()
+    if missing > 0:
+        post_ids = (Post.objects
+                    .filter(image='')
+                    .values_list('pk', flat=True)[:missing])
+        Post.objects.filter(pk__in=list(post_ids)).update(image=name)
@@ -0,0 +1,207 @@
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .middleware import request_now
+
+CARD_VERSION_KEY = 'blog:card-version:{scope}:{pk}'
+PAGE_GENERATION_KEY = 'blog:page-generation:{scope}'
+PAGE_KEY = 'blog:page:{generation}:{path}'
+COUNT_KEY = 'blog:count:{generation}:{query}'
+MODIFIED_KEY = 'blog:modified:{generation}:{now}:{scope}'
+ALL_PAGES = 'all'
+
+
+def _new_version():
+    return str(time.time_ns())
+
+
+def _versions(keys):
+    # Пропавшие из кэша версии заменяются новыми, а не начинаются заново,
+    # поэтому устаревшие записи никогда не становятся снова актуальными.
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return '.'.join(versions[key] for key in keys)
+
+
+def _bump(key):
+    # Повторная смена версии после коммита отбрасывает записи,
+    # построенные другими запросами по ещё не зафиксированным данным.
+    cache.set(key, _new_version(), timeout=None)
+    transaction.on_commit(
+        lambda: cache.set(key, _new_version(), timeout=None))
+
+
+def card_version_keys(post):
+    return [CARD_VERSION_KEY.format(scope='post', pk=post.pk),
+            CARD_VERSION_KEY.format(scope='author', pk=post.author_id),
+            CARD_VERSION_KEY.format(scope='category', pk=post.category_id),
+            CARD_VERSION_KEY.format(scope='location', pk=post.location_id)]
+
+
+def card_version(post):
+    """Версия карточки поста: меняется при правке любой её части.
+
+    Кроме версий из кэша учитывается updated_at поста: его видят и
+    изменения из других процессов с собственным кэшем (run_tasks).
+    """
+    return (f'{_versions(card_version_keys(post))}'
+            f'.{post.updated_at.timestamp()}')
+
+
+def bump_card_version(scope, pk):
+    _bump(CARD_VERSION_KEY.format(scope=scope, pk=pk))
+
+
+def purge_pages(*scopes):
+    for scope in scopes:
+        _bump(PAGE_GENERATION_KEY.format(scope=scope))
+
+
+def purge_all_pages():
+    purge_pages(ALL_PAGES)
+
+
+def cached_count(queryset, count):
+    """Результат count(queryset), общий для одинаковых запросов.
+
+    Сбрасывается любой правкой публикаций, как и кэш главной страницы.
+    """
+    try:
+        sql = str(queryset.query)
+    except EmptyResultSet:
+        return 0
+    generation = _versions([PAGE_GENERATION_KEY.format(scope=ALL_PAGES),
+                            PAGE_GENERATION_KEY.format(scope='index')])
+    key = COUNT_KEY.format(generation=generation,
+                           query=hashlib.md5(sql.encode()).hexdigest())
+    total = cache.get(key)
+    if total is None:
+        total = count(queryset)
+        cache.set(key, total, settings.BLOG_PAGINATOR_COUNT_TIMEOUT)
+    return total
+
+
+def _page_timeout(scheduled):
+    timeout = settings.BLOG_PAGE_CACHE_TIMEOUT
+    if scheduled is None:
+        return timeout
+    now = timezone.now()
+    # Недавно наступившие даты тоже в счёт: пока воркер не пересчитал
+    # видимость, страница кэшируется ненадолго.
+    next_pub_date = (scheduled
+                     .filter(pub_date__gte=now - timedelta(seconds=timeout))
+                     .aggregate(next_pub_date=Min('pub_date'))
+                     ['next_pub_date'])
+    if next_pub_date is None:
+        return timeout
+    appears_in = (next_pub_date - now).total_seconds()
+    return max(1, min(timeout, appears_in))
+
+
+def cache_page_for_anonymous(scope, scheduled=None):
+    """Кэширует страницу целиком для анонимных посетителей.
+
+    scope — шаблон области страницы, заполняемый аргументами URL;
+    scheduled — функция от тех же аргументов, возвращающая ещё не
+    видимые публикации, появление которых изменит страницу: запись не
+    переживёт ближайшую из их дат публикации. Сброс кэша при появлении
+    поста делает воркер, а его кэш может быть своим.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+            page_scope = scope.format(**kwargs)
+            generation = _versions(
+                [PAGE_GENERATION_KEY.format(scope=ALL_PAGES),
+                 PAGE_GENERATION_KEY.format(scope=page_scope)])
+            path = hashlib.md5(request.get_full_path().encode())
+            key = PAGE_KEY.format(generation=generation,
+                                  path=path.hexdigest())
+            response = cache.get(key)
+            if response is not None:
+                return response
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            timeout = _page_timeout(scheduled(**kwargs) if scheduled
+                                    else None)
+
+            def store(response):
+                cache.set(key, response, timeout)
+
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+            return response
+        return wrapper
+    return decorator
+
+
+def _timestamp(moment):
+    return int(moment.timestamp()) if moment is not None else 0
+
+
+def conditional_page(scope, modified=None):
+    """Отвечает 304 Not Modified, не вызывая представление.
+
+    Время изменения страницы — самая поздняя из версий её области scope
+    в кэше страниц и значения modified(request, **kwargs), если она
+    задана. ETag учитывает ещё пользователя, CSRF-токен и адрес.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            page_scope = scope.format(**kwargs)
+            generation = _versions(
+                [PAGE_GENERATION_KEY.format(scope=ALL_PAGES),
+                 PAGE_GENERATION_KEY.format(scope=page_scope)])
+            # Версии — отметки времени в наносекундах.
+            last_modified = max(map(int, generation.split('.'))) // 10 ** 9
+            if modified is not None:
+                # Данные меняются только вместе с поколением или окном часов.
+                key = MODIFIED_KEY.format(
+                    generation=generation,
+                    now=int(request_now(request).timestamp()),
+                    scope=hashlib.md5(page_scope.encode()).hexdigest())
+                data_modified = cache.get_or_set(
+                    key,
+                    lambda: _timestamp(modified(request, **kwargs)),
+                    settings.BLOG_CLOCK_GRANULARITY * 2)
+                last_modified = max(last_modified, data_modified)
+            etag = quote_etag(hashlib.md5('|'.join((
+                generation,
+                str(last_modified),
+                str(request.user.pk),
+                request.META.get('CSRF_COOKIE', ''),
+                request.get_full_path(),
+            )).encode()).hexdigest())
+            response = get_conditional_response(request,
+                                                etag=etag,
+                                                last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,107 @@
+import csv
+import json
+from datetime import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Comments, Post
+
+CHUNK_SIZE = 2_000
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class Export:
+    """Что выгружать: модель, поля файла и поле для выгрузки изменений.
+
+    Поля совпадают с форматом import_blog, поэтому выгрузку можно
+    загрузить обратно.
+    """
+
+    def __init__(self, model, fields, changed_field):
+        self.model = model
+        self.fields = fields
+        self.changed_field = changed_field
+
+    def rows(self, since=None, chunk_size=CHUNK_SIZE):
+        queryset = self.model.objects.order_by('pk')
+        if since is not None:
+            queryset = queryset.filter(
+                **{f'{self.changed_field}__gte': since})
+        names = list(self.fields)
+        values = queryset.values_list(*self.fields.values())
+        for row in values.iterator(chunk_size=chunk_size):
+            yield dict(zip(names, map(_plain, row)))
+
+
+EXPORTS = {
+    'posts': Export(Post, {
+        'id': 'pk',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'created_at': 'created_at',
+        'is_published': 'is_published',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'location': 'location__name',
+        'image': 'image',
+    }, changed_field='updated_at'),
+    # У комментариев нет даты изменения: выгружаются только новые.
+    'comments': Export(Comments, {
+        'id': 'pk',
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created_at': 'created_at',
+    }, changed_field='created_at'),
+}
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def parse_since(value):
+    """Момент из ISO 8601; наивное время считается местным."""
+    moment = parse_datetime(value or '')
+    if moment is None:
+        raise ValueError(f'Некорректная дата: {value!r}')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class _Line:
+    """Файлоподобный буфер для csv.writer, отдающий одну строку."""
+
+    def write(self, value):
+        return value
+
+
+def jsonl_lines(rows, fields):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def csv_lines(rows, fields):
+    writer = csv.writer(_Line())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row.values())
+
+
+FORMATS = {
+    'jsonl': jsonl_lines,
+    'csv': csv_lines,
+}
+
+
+def export_lines(kind, format, since=None, chunk_size=CHUNK_SIZE):
+    """Строки выгрузки kind в формате format, по одной записи за раз."""
+    export = EXPORTS[kind]
+    return FORMATS[format](export.rows(since, chunk_size),
+                           list(export.fields))
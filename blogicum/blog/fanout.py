@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import FeedEntry, Post
+
+BATCH_SIZE = 1_000
+
+
+def feed_entries(posts):
+    """Записи лент категории и автора для видимых постов из posts."""
+    rows = (posts
+            .filter(is_visible=True)
+            .values_list('pk', 'category_id', 'author_id', 'pub_date'))
+    for pk, category_id, author_id, pub_date in rows.iterator():
+        yield FeedEntry(kind=FeedEntry.Kind.CATEGORY, key=category_id,
+                        post_id=pk, pub_date=pub_date)
+        yield FeedEntry(kind=FeedEntry.Kind.AUTHOR, key=author_id,
+                        post_id=pk, pub_date=pub_date)
+
+
+@transaction.atomic
+def fan_out(post_ids):
+    """Перестраивает записи лент для постов post_ids."""
+    post_ids = list(post_ids)
+    for start in range(0, len(post_ids), BATCH_SIZE):
+        batch = post_ids[start:start + BATCH_SIZE]
+        FeedEntry.objects.filter(post_id__in=batch).delete()
+        FeedEntry.objects.bulk_create(
+            feed_entries(Post.objects.filter(pk__in=batch)),
+            batch_size=BATCH_SIZE)
+
+
+FEED_KEYS = {
+    FeedEntry.Kind.CATEGORY: 'category_id',
+    FeedEntry.Kind.AUTHOR: 'author_id',
+}
+
+
+def inconsistent_posts():
+    """Id постов, чьи записи лент не совпадают с ожидаемыми.
+
+    Сравнение идёт в базе через NOT EXISTS по индексам обеих таблиц,
+    в Python попадают только id разошедшихся постов.
+    """
+    broken = set()
+    for kind, key_field in FEED_KEYS.items():
+        expected = Post.objects.filter(pk=OuterRef('post_id'),
+                                       is_visible=True,
+                                       pub_date=OuterRef('pub_date'),
+                                       **{key_field: OuterRef('key')})
+        broken.update(FeedEntry.objects
+                      .filter(~Exists(expected), kind=kind)
+                      .values_list('post_id', flat=True)
+                      .iterator())
+        actual = FeedEntry.objects.filter(kind=kind,
+                                          key=OuterRef(key_field),
+                                          post=OuterRef('pk'),
+                                          pub_date=OuterRef('pub_date'))
+        broken.update(Post.objects
+                      .filter(~Exists(actual), is_visible=True)
+                      .values_list('pk', flat=True)
+                      .iterator())
+    return broken
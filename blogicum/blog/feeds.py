@@ -0,0 +1,93 @@
+import hashlib
+
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date, quote_etag
+
+from .models import FeedSnapshot
+
+FEED_SIZE = 20
+FEED_GENERATORS = {
+    FeedSnapshot.FeedType.RSS: Rss201rev2Feed,
+    FeedSnapshot.FeedType.ATOM: Atom1Feed,
+}
+
+
+def render_feed(request, feed_type, title, link, posts):
+    feed = FEED_GENERATORS[feed_type](
+        title=title,
+        link=request.build_absolute_uri(link),
+        description=title,
+        language='ru',
+        feed_url=request.build_absolute_uri())
+    for post in posts[:FEED_SIZE]:
+        url = request.build_absolute_uri(
+            reverse('blog:post_detail', args=(post.pk,)))
+        feed.add_item(
+            title=post.title,
+            link=url,
+            unique_id=url,
+            description=post.text,
+            pubdate=post.pub_date,
+            author_name=post.author.get_username(),
+            categories=[post.category.title] if post.category else None)
+    return feed.writeString('utf-8')
+
+
+def get_snapshot(request, feed_type, scope, source):
+    """Снимок ленты; перестраивается, только если устарел.
+
+    source() возвращает заголовок, ссылку и видимые посты ленты.
+    """
+    now = timezone.now()
+    snapshot = (FeedSnapshot.objects
+                .filter(scope=scope, feed_type=feed_type)
+                .first())
+    if snapshot is not None and (snapshot.expires_at is None
+                                 or snapshot.expires_at > now):
+        return snapshot
+    title, link, posts = source()
+    content = render_feed(request, feed_type, title, link, posts)
+    etag = quote_etag(hashlib.sha1(content.encode()).hexdigest())
+    if snapshot is not None and snapshot.etag == etag:
+        last_modified = snapshot.last_modified
+    else:
+        last_modified = now
+    snapshot, _ = FeedSnapshot.objects.update_or_create(
+        scope=scope,
+        feed_type=feed_type,
+        defaults={
+            'content': content,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires_at': None,
+        })
+    return snapshot
+
+
+def feed_response(request, feed_type, scope, source):
+    if feed_type not in FEED_GENERATORS:
+        raise Http404('Неизвестный формат ленты')
+    snapshot = get_snapshot(request, feed_type, scope, source)
+    last_modified = int(snapshot.last_modified.timestamp())
+    response = get_conditional_response(request,
+                                        etag=snapshot.etag,
+                                        last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(
+            snapshot.content,
+            content_type=FEED_GENERATORS[feed_type].content_type)
+    response['ETag'] = snapshot.etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def expire_feeds(*scopes):
+    """Помечает ленты устаревшими; без scopes — все ленты."""
+    snapshots = FeedSnapshot.objects.all()
+    if scopes:
+        snapshots = snapshots.filter(scope__in=scopes)
+    snapshots.update(expires_at=timezone.now())
@@ -1,6 +1,16 @@
 from django import forms
 
 from .models import User, Comments, Post
+from .validators import validate_image_limits
+
+
+class LimitedImageField(forms.ImageField):
+
+    def to_python(self, data):
+        # Проверка до того, как Pillow откроет файл целиком.
+        if data:
+            validate_image_limits(data)
+        return super().to_python(data)
 
 
 class UserForm(forms.ModelForm):
@@ -30,3 +40,4 @@ class PostForm(forms.ModelForm):
                   'category')
         widgets = {'pub_date': forms.DateTimeInput(
             attrs={'type': 'datetime-local'})}
+        field_classes = {'image': LimitedImageField}
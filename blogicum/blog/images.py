@@ -0,0 +1,78 @@
+import os
+from collections import namedtuple
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+VARIANTS = {
+    'admin': (200, 200),
+    'card': (640, 640),
+    'detail': (1280, 1280),
+}
+VARIANT_QUALITY = 80
+
+ImageVariant = namedtuple('ImageVariant', ('url', 'width', 'height'))
+
+
+def variant_name(name, variant):
+    # Расширение остаётся в имени: pic.png и pic.jpg — разные оригиналы.
+    root, extension = os.path.splitext(name)
+    return f'{root}_{extension.lstrip(".")}_{variant}.jpg'
+
+
+def _render_variant(original, size):
+    image = original.copy()
+    image.thumbnail(size)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=VARIANT_QUALITY,
+               optimize=True, progressive=True)
+    return ContentFile(buffer.getvalue())
+
+
+def missing_variants(image_file, variants=None):
+    storage = image_file.storage
+    names = {variant: variant_name(image_file.name, variant)
+             for variant in (variants or VARIANTS)}
+    return {variant: name for variant, name in names.items()
+            if not storage.exists(name)}
+
+
+def make_variants(image_file, variants=None):
+    """Создаёт уменьшенные копии изображения рядом с оригиналом."""
+    storage = image_file.storage
+    missing = missing_variants(image_file, variants)
+    if not missing:
+        return
+    with storage.open(image_file.name) as source:
+        original = Image.open(source)
+        # JPEG декодируется сразу в уменьшенном масштабе.
+        original.draft('RGB', max(VARIANTS.values()))
+        original = ImageOps.exif_transpose(original)
+        for variant, name in missing.items():
+            storage.save(name, _render_variant(original, VARIANTS[variant]))
+
+
+def get_variant(image_file, variant):
+    """Возвращает готовую копию нужного размера.
+
+    Копии создаёт фоновая задача; пока копии нет или оригинал не
+    читается, отдаётся сам оригинал без размеров.
+    """
+    storage = image_file.storage
+    name = variant_name(image_file.name, variant)
+    try:
+        if not storage.exists(name):
+            return ImageVariant(image_file.url, None, None)
+        with storage.open(name) as source:
+            width, height = Image.open(source).size
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return ImageVariant(image_file.url, None, None)
+    return ImageVariant(storage.url(name), width, height)
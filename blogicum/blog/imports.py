@@ -0,0 +1,245 @@
+import csv
+import json
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from .cache import bump_card_version
+from .models import Category, Comments, Location, Post, User
+from .search import index_posts
+from .tasks import schedule_publications
+from .visibility import refresh_visibility
+
+LOOKUP_CHUNK = 500
+TRUE_VALUES = ('1', 'true', 'yes', 'да')
+
+
+class ImportDataError(ValueError):
+    pass
+
+
+def read_records(path, format):
+    """Потоково читает записи из JSON Lines или CSV; '-' — stdin."""
+    source = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        if format == 'csv':
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def batched(records, size):
+    records = iter(records)
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def parse_datetime(value):
+    if not value:
+        return timezone.now()
+    moment = datetime.fromisoformat(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_bool(value, default=True):
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in TRUE_VALUES
+
+
+def new_user(username):
+    return User(username=username, password=make_password(None))
+
+
+class KeyLookup:
+    """Сопоставляет естественные ключи с id, догружая их пачками.
+
+    Ключи, которых нет в базе, создаются через make(key); без make
+    они считаются ошибкой.
+    """
+
+    def __init__(self, model, field, make=None):
+        self.model = model
+        self.field = field
+        self.make = make
+        self.ids = {}
+
+    def load(self, keys):
+        missing = list({key for key in keys
+                        if key and key not in self.ids})
+        for start in range(0, len(missing), LOOKUP_CHUNK):
+            chunk = missing[start:start + LOOKUP_CHUNK]
+            self.ids.update(self.model.objects
+                            .filter(**{f'{self.field}__in': chunk})
+                            .values_list(self.field, 'pk'))
+            new = [key for key in chunk if key not in self.ids]
+            if not new:
+                continue
+            if self.make is None:
+                raise ImportDataError(
+                    f'{self.model._meta.verbose_name} не найдены: '
+                    f'{", ".join(map(str, new[:10]))}')
+            self.model.objects.bulk_create(map(self.make, new))
+            self.ids.update(self.model.objects
+                            .filter(**{f'{self.field}__in': new})
+                            .values_list(self.field, 'pk'))
+
+    def __getitem__(self, key):
+        return self.ids[key] if key else None
+
+
+@contextmanager
+def keep_created_at(model):
+    """Сохраняет created_at из файла вместо времени загрузки."""
+    field = model._meta.get_field('created_at')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Importer:
+    """Загружает записи пачками через bulk_create в обход сигналов.
+
+    Производные данные (видимость, ленты, поиск, счётчики
+    комментариев) по умолчанию обновляются после каждой пачки;
+    с deferred=True их пересчитывает вызывающий код после загрузки.
+    """
+
+    model = None
+
+    def __init__(self, batch_size, deferred=False):
+        self.batch_size = batch_size
+        self.deferred = deferred
+        self.high_water = self.model.objects.aggregate(
+            high_water=Max('pk'))['high_water'] or 0
+
+    def run(self, records, progress=None):
+        total = 0
+        with keep_created_at(self.model):
+            for batch in batched(records, self.batch_size):
+                total += self.load(batch)
+                if progress:
+                    progress(total)
+        return total
+
+    @transaction.atomic
+    def load(self, records):
+        self.resolve(records)
+        objects = [self.build(record) for record in records]
+        self.model.objects.bulk_create(objects)
+        if not self.deferred:
+            self.after_load(objects)
+        return len(objects)
+
+    def inserted(self, objects):
+        # SQLite не возвращает id из bulk_create: новые строки находятся
+        # выше прежнего максимума. Повторная обработка чужих строк
+        # безвредна, все обновления идемпотентны.
+        ids = {obj.pk for obj in objects if obj.pk is not None}
+        if len(ids) < len(objects):
+            ids.update(self.model.objects
+                       .filter(pk__gt=self.high_water)
+                       .values_list('pk', flat=True))
+        self.high_water = max(ids, default=self.high_water)
+        return sorted(ids)
+
+    def resolve(self, records):
+        pass
+
+    def build(self, record):
+        raise NotImplementedError
+
+    def after_load(self, objects):
+        pass
+
+
+class PostImporter(Importer):
+    model = Post
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.users = KeyLookup(User, 'username', make=new_user)
+        self.categories = KeyLookup(Category, 'slug', make=lambda slug: (
+            Category(slug=slug, title=slug, description='')))
+        self.locations = KeyLookup(Location, 'name', make=lambda name: (
+            Location(name=name)))
+
+    def resolve(self, records):
+        self.users.load(record['author'] for record in records)
+        self.categories.load(record.get('category') for record in records)
+        self.locations.load(record.get('location') for record in records)
+
+    def build(self, record):
+        return Post(pk=record.get('id') or None,
+                    title=record['title'],
+                    text=record['text'],
+                    pub_date=parse_datetime(record.get('pub_date')),
+                    created_at=parse_datetime(record.get('created_at')),
+                    is_published=parse_bool(record.get('is_published')),
+                    author_id=self.users[record['author']],
+                    category_id=self.categories[record.get('category')],
+                    location_id=self.locations[record.get('location')],
+                    image=record.get('image') or '')
+
+    def after_load(self, objects):
+        ids = self.inserted(objects)
+        posts = Post.objects.filter(pk__in=ids)
+        refresh_visibility(posts)
+        schedule_publications(posts)
+        index_posts(posts.values_list('pk', 'title', 'text'))
+
+
+class CommentImporter(Importer):
+    model = Comments
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.users = KeyLookup(User, 'username', make=new_user)
+        self.posts = KeyLookup(Post, 'pk')
+
+    def resolve(self, records):
+        self.users.load(record['author'] for record in records)
+        self.posts.load(int(record['post']) for record in records)
+
+    def build(self, record):
+        return Comments(text=record['text'],
+                        created_at=parse_datetime(record.get('created_at')),
+                        author_id=self.users[record['author']],
+                        post_id=self.posts[int(record['post'])])
+
+    def after_load(self, objects):
+        counts = Counter(comment.post_id for comment in objects)
+        now = timezone.now()
+        for post_id, count in counts.items():
+            (Post.objects
+             .filter(pk=post_id)
+             .update(comment_count=F('comment_count') + count,
+                     updated_at=now))
+            bump_card_version('post', post_id)
+
+
+IMPORTERS = {
+    'posts': PostImporter,
+    'comments': CommentImporter,
+}
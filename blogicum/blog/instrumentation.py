@@ -0,0 +1,139 @@
+import logging
+import threading
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends import django as django_backend
+from django.template.exceptions import TemplateDoesNotExist
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('blog_request_metrics', default=None)
+_stats_lock = threading.Lock()
+_stats = defaultdict(Counter)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    """Запросы к базе и время одного HTTP-запроса."""
+
+    def __init__(self):
+        self.queries = []
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.started = perf_counter()
+        self.total_time = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(sql)
+            self.sql_time += perf_counter() - started
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current.reset(self._token)
+        self._stack.close()
+        self.total_time = perf_counter() - self.started
+
+    def duplicates(self):
+        """Одинаковые SELECT, различающиеся только параметрами (N+1)."""
+        selects = Counter(sql for sql in self.queries
+                          if sql.lstrip()[:6].upper() == 'SELECT')
+        return {sql: count for sql, count in selects.items() if count > 1}
+
+    def server_timing(self):
+        return ', '.join((
+            f'db;dur={self.sql_time * 1000:.1f};'
+            f'desc="{len(self.queries)} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ))
+
+
+def record_template_time(seconds):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.template_time += seconds
+
+
+def record(view_name, metrics):
+    """Добавляет запрос в сводку и проверяет бюджет запросов view_name."""
+    queries = len(metrics.queries)
+    with _stats_lock:
+        stats = _stats[view_name]
+        stats['requests'] += 1
+        stats['queries'] += queries
+        stats['max_queries'] = max(stats['max_queries'], queries)
+        stats['sql_ms'] += metrics.sql_time * 1000
+        stats['template_ms'] += metrics.template_time * 1000
+        stats['total_ms'] += metrics.total_time * 1000
+    logger.debug('%s: %s', view_name, metrics.server_timing())
+    duplicates = metrics.duplicates()
+    if duplicates:
+        logger.warning('%s: повторяющиеся запросы (%s): %s',
+                       view_name, sum(duplicates.values()),
+                       max(duplicates, key=duplicates.get))
+    budget = settings.BLOG_QUERY_BUDGETS.get(
+        view_name, settings.BLOG_QUERY_BUDGET_DEFAULT)
+    if budget is not None and queries > budget:
+        message = f'{view_name}: {queries} запросов при бюджете {budget}'
+        if settings.BLOG_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+def view_stats():
+    """Сводка по представлениям с начала работы процесса."""
+    with _stats_lock:
+        return {view_name: {
+            'requests': stats['requests'],
+            'avg_queries': stats['queries'] / stats['requests'],
+            'max_queries': stats['max_queries'],
+            'avg_sql_ms': stats['sql_ms'] / stats['requests'],
+            'avg_template_ms': stats['template_ms'] / stats['requests'],
+            'avg_total_ms': stats['total_ms'] / stats['requests'],
+        } for view_name, stats in sorted(_stats.items())}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class Template(django_backend.Template):
+
+    def render(self, context=None, request=None):
+        started = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record_template_time(perf_counter() - started)
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """Бэкенд шаблонов Django, учитывающий время отрисовки."""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
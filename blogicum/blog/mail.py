@@ -0,0 +1,31 @@
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .tasks import encode_attachment, send_email
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Ставит письма в очередь фоновых задач вместо отправки в запросе."""
+
+    def send_messages(self, email_messages):
+        # Вложения проверяются до постановки в очередь: письма либо
+        # уходят в очередь целиком, либо не уходят вовсе.
+        payloads = [self.payload(message) for message in email_messages]
+        for payload in payloads:
+            send_email.delay(payload)
+        return len(email_messages)
+
+    @staticmethod
+    def payload(message):
+        return {
+            'subject': message.subject,
+            'body': message.body,
+            'from_email': message.from_email,
+            'to': message.to,
+            'cc': message.cc,
+            'bcc': message.bcc,
+            'reply_to': message.reply_to,
+            'headers': message.extra_headers,
+            'alternatives': getattr(message, 'alternatives', []),
+            'attachments': [encode_attachment(attachment)
+                            for attachment in message.attachments],
+        }
@@ -0,0 +1,85 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+
+from blog.benchmarks import seed_posts
+from blog.models import Comments, Post, User
+
+
+class Command(BaseCommand):
+    help = ('Нагрузка: ленты читаются параллельно с добавлением'
+            ' комментариев. Сравните запуск с настройками по умолчанию и'
+            ' с blogicum.settings_production. Запускайте только на'
+            ' отдельной копии базы.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=10)
+
+    def read_feed(self):
+        while time.monotonic() < self.deadline:
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    list(Post.objects
+                         .select_related('author', 'category')
+                         .filter(is_visible=True)
+                         .order_by('-pub_date')[:50])
+                    Post.objects.count()
+            except OperationalError as error:
+                self.errors.append(error)
+                continue
+            self.reads.append(time.perf_counter() - started)
+        connection.close()
+
+    def write_comments(self, post_ids, author):
+        number = 0
+        while time.monotonic() < self.deadline:
+            post_id = post_ids[number % len(post_ids)]
+            number += 1
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    Comments.objects.create(post_id=post_id,
+                                            author=author,
+                                            text='Нагрузочный тест')
+            except OperationalError as error:
+                self.errors.append(error)
+                continue
+            self.writes.append(time.perf_counter() - started)
+        connection.close()
+
+    def handle(self, *args, **options):
+        seed_posts(options['posts'], stdout=self.stdout)
+        post_ids = list(Post.objects.values_list('pk', flat=True)[:100])
+        author = User.objects.order_by('pk').first()
+        self.deadline = time.monotonic() + options['seconds']
+        self.reads = []
+        self.writes = []
+        self.errors = []
+        threads = (
+            [threading.Thread(target=self.read_feed)
+             for _ in range(options['readers'])]
+            + [threading.Thread(target=self.write_comments,
+                                args=(post_ids, author))
+               for _ in range(options['writers'])])
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for name, timings in (('Чтение', self.reads),
+                              ('Запись', self.writes)):
+            if not timings:
+                self.stdout.write(f'{name}: нет успешных операций')
+                continue
+            quantiles = statistics.quantiles(timings, n=20)
+            self.stdout.write(
+                f'{name}: {len(timings)} операций,'
+                f' p50 {statistics.median(timings) * 1000:.1f} мс,'
+                f' p95 {quantiles[-1] * 1000:.1f} мс')
+        self.stdout.write(f'Ошибок «database is locked»: {len(self.errors)}')
@@ -0,0 +1,66 @@
+import random
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.benchmarks import BENCH_PREFIX, seed_posts
+from blog.models import Category, FeedEntry, User
+from blog.views import POST_ON_PAGE, feed_entries, query
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает ленты категорий и авторов по таблице Post с'
+            ' JOIN-ами и по таблице FeedEntry. Запускайте только на'
+            ' отдельной копии базы.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=500_000)
+        parser.add_argument('--authors', type=int, default=100_000)
+        parser.add_argument('--categories', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        seed_posts(options['posts'],
+                   authors=options['authors'],
+                   categories=options['categories'],
+                   stdout=self.stdout)
+        started = time.perf_counter()
+        call_command('rebuild_feed_entries', full=True, stdout=self.stdout)
+        self.stdout.write(
+            f'Заполнение FeedEntry: {time.perf_counter() - started:.1f} с')
+        categories = random.sample(
+            list(Category.objects
+                 .filter(slug__startswith=BENCH_PREFIX, is_published=True)
+                 .values_list('pk', 'slug')),
+            options['repeat'])
+        authors = random.sample(
+            list(User.objects
+                 .filter(username__startswith=BENCH_PREFIX)
+                 .values_list('pk', 'username')),
+            options['repeat'])
+        now = timezone.now()
+        published = dict(is_published=True,
+                         pub_date__lt=now,
+                         category__is_published=True)
+        cases = {
+            'категория, JOIN': (categories, lambda pk, slug: query().filter(
+                category__slug=slug, **published)),
+            'категория, FeedEntry': (categories, lambda pk, slug: feed_entries(
+                FeedEntry.Kind.CATEGORY, pk)),
+            'автор, JOIN': (authors, lambda pk, username: query().filter(
+                author__username=username, **published)),
+            'автор, FeedEntry': (authors, lambda pk, username: feed_entries(
+                FeedEntry.Kind.AUTHOR, pk)),
+        }
+        for name, (scopes, feed) in cases.items():
+            started = time.perf_counter()
+            for pk, slug in scopes:
+                queryset = feed(pk, slug)
+                page = list(queryset[:POST_ON_PAGE])
+                if queryset.model is FeedEntry:
+                    query().in_bulk([entry.post_id for entry in page])
+                queryset.order_by().values('pk').count()
+            elapsed = (time.perf_counter() - started) / len(scopes)
+            self.stdout.write(f'{name}: {elapsed * 1000:.2f} мс на страницу')
@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from blog.benchmarks import (BENCH_PREFIX, add_database_argument,
+                             bench_database, seed_posts)
+from blog.models import Category, Comments, Post, User
+from blog.views import query
+
+
+class Command(BaseCommand):
+    help = ('Заполняет отдельную базу --database публикациями и'
+            ' сравнивает планы и время запросов лент без составных'
+            ' индексов и с ними.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--authors', type=int, default=1_000)
+        parser.add_argument('--categories', type=int, default=100)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        add_database_argument(parser)
+
+    def handle(self, *args, **options):
+        with bench_database(options['database']):
+            self.run(options)
+
+    def run(self, options):
+        seed_posts(options['posts'],
+                   authors=options['authors'],
+                   categories=options['categories'],
+                   batch_size=options['batch_size'],
+                   stdout=self.stdout)
+        author = User.objects.filter(
+            username__startswith=BENCH_PREFIX).first()
+        category = Category.objects.filter(
+            slug__startswith=BENCH_PREFIX).first()
+        feeds = {
+            'index': query().filter(is_visible=True),
+            'category': query().filter(category=category, is_visible=True),
+            'profile': query().filter(author__username=author.username),
+        }
+        indexes = [(model, index)
+                   for model in (Post, Comments)
+                   for index in model._meta.indexes]
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.remove_index(model, index)
+        self.analyze()
+        self.report('Без индексов', feeds, options['repeat'])
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+        self.analyze()
+        self.report('С индексами', feeds, options['repeat'])
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def report(self, title, feeds, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, queryset in feeds.items():
+            page = queryset[:10]
+            self.stdout.write(f'{name}:\n{page.explain()}')
+            started = time.perf_counter()
+            for _ in range(repeat):
+                list(page)
+            elapsed = (time.perf_counter() - started) / repeat
+            self.stdout.write(f'{name}: {elapsed * 1000:.2f} мс на страницу')
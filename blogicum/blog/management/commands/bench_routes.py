@@ -0,0 +1,195 @@
+import json
+import random
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from blog import urls as blog_urls
+from blog.benchmarks import (VOCABULARY, add_database_argument,
+                             bench_database, seed_comments, seed_images,
+                             seed_posts)
+from blog.instrumentation import RequestMetrics
+from blog.models import Comments, Post
+from pages import urls as pages_urls
+
+URL_MODULES = (blog_urls, pages_urls)
+QUERY_STRINGS = {
+    'blog:search': lambda: {'q': ' '.join(random.sample(VOCABULARY, 2))},
+}
+
+
+def percentile(timings, percent):
+    if len(timings) < 2:
+        return timings[0]
+    return statistics.quantiles(timings, n=100)[percent - 1]
+
+
+def current_commit():
+    try:
+        return subprocess.run(('git', 'rev-parse', '--short', 'HEAD'),
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ('Заполняет отдельную базу --database синтетическими данными'
+            ' и замеряет каждый именованный адрес blog и pages через'
+            ' тестовый клиент.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=20_000)
+        parser.add_argument('--comments', type=int, default=100_000)
+        parser.add_argument('--images', type=int, default=1_000)
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Запросов на адрес для каждого клиента.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Зерно генератора случайных чисел.')
+        parser.add_argument('--no-cache',
+                            action='store_true',
+                            help='Очищать кэш перед каждым запросом.')
+        parser.add_argument('--output',
+                            help='Сохранить результаты в JSON-файл.')
+        parser.add_argument('--compare',
+                            help='JSON-файл прошлого прогона для сравнения.')
+        add_database_argument(parser)
+
+    def handle(self, *args, **options):
+        with bench_database(options['database']):
+            self.run(options)
+
+    def run(self, options):
+        random.seed(options['seed'])
+        self.seed(options)
+        post = (Post.objects
+                .filter(is_visible=True, comment_count__gt=0)
+                .select_related('author', 'category')
+                .order_by('-comment_count', 'pk')
+                .first())
+        if post is None:
+            raise CommandError('Нет видимых публикаций с комментариями')
+        samples = {
+            'post_id': post.pk,
+            'comment_id': Comments.objects.filter(post=post).first().pk,
+            'category_slug': post.category.slug,
+            'username': post.author.username,
+            'feed_type': 'rss',
+            'kind': 'posts',
+        }
+        author = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        author.force_login(post.author)
+        clients = {
+            'anonymous': Client(HTTP_HOST=settings.ALLOWED_HOSTS[0]),
+            'author': author,
+        }
+        routes = {}
+        for name, url in self.routes(samples):
+            routes[name] = {
+                client_name: self.measure(client, name, url, options)
+                for client_name, client in clients.items()}
+            self.report(name, routes[name])
+        results = {
+            'commit': current_commit(),
+            'created': timezone.now().isoformat(),
+            'options': {key: options[key] for key in (
+                'users', 'categories', 'locations', 'posts', 'comments',
+                'images', 'requests', 'seed', 'no_cache')},
+            'routes': routes,
+        }
+        if options['output']:
+            Path(options['output']).write_text(
+                json.dumps(results, ensure_ascii=False, indent=2))
+        if options['compare']:
+            self.compare(json.loads(Path(options['compare']).read_text()),
+                         results)
+
+    def seed(self, options):
+        seed_posts(options['posts'],
+                   authors=options['users'],
+                   categories=options['categories'],
+                   locations=options['locations'],
+                   stdout=self.stdout)
+        seed_comments(options['comments'], stdout=self.stdout)
+        seed_images(options['images'])
+        # Массовая вставка обходит сигналы: производные таблицы
+        # пересчитываются так же, как после восстановления базы.
+        call_command('recount_comments', stdout=self.stdout)
+        call_command('rebuild_feed_entries', full=True, stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        cache.clear()
+
+    def routes(self, samples):
+        for module in URL_MODULES:
+            for pattern in module.urlpatterns:
+                if not pattern.name:
+                    continue
+                name = f'{module.app_name}:{pattern.name}'
+                kwargs = {key: samples[key]
+                          for key in pattern.pattern.converters}
+                yield name, reverse(name, kwargs=kwargs)
+
+    def measure(self, client, name, url, options):
+        make_query = QUERY_STRINGS.get(name, dict)
+        client.get(url, make_query())
+        timings = []
+        queries = []
+        statuses = set()
+        started = time.perf_counter()
+        for _ in range(options['requests']):
+            if options['no_cache']:
+                cache.clear()
+            data = make_query()
+            with RequestMetrics() as metrics:
+                response = client.get(url, data)
+            timings.append(metrics.total_time * 1000)
+            queries.append(len(metrics.queries))
+            statuses.add(response.status_code)
+        elapsed = time.perf_counter() - started
+        return {
+            'url': url,
+            'statuses': sorted(statuses),
+            'rps': options['requests'] / elapsed,
+            'p50_ms': percentile(timings, 50),
+            'p95_ms': percentile(timings, 95),
+            'p99_ms': percentile(timings, 99),
+            'queries': max(queries),
+        }
+
+    def report(self, name, clients):
+        for client_name, stats in clients.items():
+            self.stdout.write(
+                f'{name:<28} {client_name:<9}'
+                f' {",".join(map(str, stats["statuses"])):<7}'
+                f' {stats["rps"]:8.1f} rps'
+                f'  p50 {stats["p50_ms"]:7.2f}'
+                f'  p95 {stats["p95_ms"]:7.2f}'
+                f'  p99 {stats["p99_ms"]:7.2f} мс'
+                f'  запросов {stats["queries"]}')
+
+    def compare(self, before, after):
+        self.stdout.write(
+            f'Сравнение с {before.get("commit") or before["created"]}:')
+        for name, clients in after['routes'].items():
+            for client_name, stats in clients.items():
+                old = before['routes'].get(name, {}).get(client_name)
+                if old is None:
+                    continue
+                change = (stats['p50_ms'] / old['p50_ms'] - 1) * 100
+                self.stdout.write(
+                    f'{name:<28} {client_name:<9}'
+                    f' p50 {old["p50_ms"]:7.2f} → {stats["p50_ms"]:7.2f} мс'
+                    f' ({change:+.0f}%)'
+                    f'  запросов {old["queries"]} → {stats["queries"]}')
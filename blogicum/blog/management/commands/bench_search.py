@@ -0,0 +1,40 @@
+import random
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from blog.benchmarks import VOCABULARY, seed_posts
+from blog.models import Post
+from blog.search import search_posts
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает поиск по индексу с LIKE-поиском на синтетических'
+            ' публикациях. Запускайте только на отдельной копии базы.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--queries', type=int, default=20)
+
+    def handle(self, *args, **options):
+        seed_posts(options['posts'], stdout=self.stdout)
+        started = time.perf_counter()
+        call_command('rebuild_search_index', stdout=self.stdout)
+        self.stdout.write(
+            f'Индексация: {time.perf_counter() - started:.1f} с')
+        queries = [' '.join(random.sample(VOCABULARY, 2))
+                   for _ in range(options['queries'])]
+        strategies = {
+            'LIKE': lambda words: Post.objects.filter(
+                *(Q(title__icontains=word) | Q(text__icontains=word)
+                  for word in words.split())),
+            'индекс': search_posts,
+        }
+        for name, strategy in strategies.items():
+            started = time.perf_counter()
+            for words in queries:
+                list(strategy(words)[:10])
+            elapsed = (time.perf_counter() - started) / len(queries)
+            self.stdout.write(f'{name}: {elapsed * 1000:.2f} мс на запрос')
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.exports import (CHUNK_SIZE, EXPORTS, FORMATS, export_lines,
+                          parse_since)
+
+
+class Command(BaseCommand):
+    help = ('Потоково выгружает публикации или комментарии в JSON Lines'
+            ' или CSV в формате import_blog.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=sorted(FORMATS),
+                            default='jsonl')
+        parser.add_argument('--since',
+                            help='Только изменённые с этого момента'
+                                 ' (ISO 8601).')
+        parser.add_argument('--output', default='-',
+                            help="Файл для выгрузки или '-' (stdout).")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            since = (parse_since(options['since'])
+                     if options['since'] else None)
+        except ValueError as error:
+            raise CommandError(error)
+        lines = export_lines(options['kind'], options['format'], since,
+                             chunk_size=options['chunk_size'])
+        if options['output'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(lines)
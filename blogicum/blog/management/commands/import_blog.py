@@ -0,0 +1,87 @@
+import time
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from blog.cache import purge_all_pages
+from blog.feeds import expire_feeds
+from blog.imports import IMPORTERS, ImportDataError, read_records
+from blog.models import Comments, FeedEntry, Post, PostTerm
+from blog.tasks import schedule_publications
+from blog.visibility import visible_q
+
+INDEXED_MODELS = (Post, Comments, FeedEntry, PostTerm)
+
+
+class Command(BaseCommand):
+    help = ('Загружает публикации или комментарии из JSON Lines или CSV'
+            ' пачками через bulk_create. Авторы, категории и'
+            ' местоположения находятся по username, slug и name и'
+            ' создаются, если их нет; комментарии ссылаются на id поста.'
+            ' Отложенным постам ставится пересчёт видимости на'
+            ' момент публикации.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path', help="Файл с записями или '-' (stdin).")
+        parser.add_argument('--format', choices=('jsonl', 'csv'),
+                            help='По умолчанию определяется по расширению.')
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--rebuild',
+                            action='store_true',
+                            help='Не обновлять ленты, поиск и счётчики'
+                                 ' после каждой пачки, а пересчитать их'
+                                 ' целиком в конце.')
+        parser.add_argument('--drop-indexes',
+                            action='store_true',
+                            help='Удалить составные индексы на время'
+                                 ' загрузки и создать их заново.')
+
+    def handle(self, *args, **options):
+        format = options['format'] or (
+            'csv' if Path(options['path']).suffix == '.csv' else 'jsonl')
+        importer = IMPORTERS[options['kind']](options['batch_size'],
+                                              deferred=options['rebuild'])
+        records = read_records(options['path'], format)
+        started = time.perf_counter()
+        indexes = [(model, index)
+                   for model in INDEXED_MODELS
+                   for index in model._meta.indexes]
+        if options['drop_indexes']:
+            self.alter_indexes('remove_index', indexes)
+        try:
+            total = importer.run(records, progress=self.progress)
+            if options['rebuild']:
+                self.rebuild()
+        except (ImportDataError, KeyError, ValueError) as error:
+            raise CommandError(f'Ошибка в данных: {error!r}')
+        finally:
+            # Индексы создаются одним проходом по уже загруженным строкам.
+            if options['drop_indexes']:
+                self.alter_indexes('add_index', indexes)
+        purge_all_pages()
+        expire_feeds()
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено записей: {total}'
+            f' за {time.perf_counter() - started:.1f} с'))
+
+    def progress(self, total):
+        self.stdout.write(f'Загружено: {total}', ending='\r')
+
+    def alter_indexes(self, method, indexes):
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                getattr(editor, method)(model, index)
+
+    def rebuild(self):
+        now = timezone.now()
+        (Post.objects
+         .filter(visible_q(now), is_visible=False)
+         .update(is_visible=True, updated_at=now))
+        schedule_publications(Post.objects.all())
+        call_command('rebuild_feed_entries', full=True, stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        call_command('recount_comments', stdout=self.stdout)
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog.fanout import BATCH_SIZE, fan_out, feed_entries, inconsistent_posts
+from blog.models import FeedEntry, Post
+
+
+class Command(BaseCommand):
+    help = ('Проверяет таблицу лент категорий и авторов и исправляет'
+            ' записи постов, которые разошлись с публикациями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check',
+                            action='store_true',
+                            help='Только проверить; код выхода 1 при'
+                                 ' расхождениях.')
+        parser.add_argument('--full',
+                            action='store_true',
+                            help='Заполнить таблицу заново целиком.')
+
+    def handle(self, *args, **options):
+        if options['full']:
+            with transaction.atomic():
+                FeedEntry.objects.all().delete()
+                FeedEntry.objects.bulk_create(
+                    feed_entries(Post.objects.all()),
+                    batch_size=BATCH_SIZE)
+            self.stdout.write(self.style.SUCCESS(
+                f'Записей лент: {FeedEntry.objects.count()}'))
+            return
+        broken = inconsistent_posts()
+        self.stdout.write(f'Постов с расхождениями: {len(broken)}')
+        if options['check']:
+            if broken:
+                raise CommandError('Таблица лент не согласована')
+            return
+        fan_out(sorted(broken))
+        self.stdout.write(self.style.SUCCESS('Записи лент исправлены'))
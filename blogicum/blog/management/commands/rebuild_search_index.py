@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from blog.models import Post, PostTerm
+from blog.search import insert_terms, post_terms
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2_000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        with transaction.atomic(), connection.cursor() as cursor:
+            PostTerm.objects.all().delete()
+            rows = []
+            posts = (Post.objects
+                     .values_list('pk', 'title', 'text')
+                     .iterator(chunk_size=batch_size))
+            for count, (pk, title, text) in enumerate(posts, start=1):
+                rows.extend((pk, term, weight) for term, weight
+                            in post_terms(Post(title=title, text=text)))
+                if count % batch_size == 0:
+                    insert_terms(cursor, rows)
+                    rows = []
+                    self.stdout.write(f'Проиндексировано: {count}',
+                                      ending='\r')
+            insert_terms(cursor, rows)
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен'))
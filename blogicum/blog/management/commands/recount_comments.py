@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from blog.cache import bump_card_version
+from blog.models import Comments, Post
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые счётчики комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run',
+                            action='store_true',
+                            help='Только показать расхождения.')
+
+    def handle(self, *args, **options):
+        counts = (Comments.objects
+                  .filter(post=OuterRef('pk'))
+                  .order_by()
+                  .values('post')
+                  .annotate(total=Count('pk'))
+                  .values('total'))
+        with transaction.atomic():
+            broken = (Post.objects
+                      .annotate(actual=Coalesce(Subquery(counts), 0))
+                      .exclude(comment_count=F('actual')))
+            if options['dry_run']:
+                for post_id, stored, actual in broken.values_list(
+                        'pk', 'comment_count', 'actual'):
+                    self.stdout.write(
+                        f'Пост {post_id}: {stored} -> {actual}')
+                self.stdout.write(f'Расхождений: {broken.count()}')
+                return
+            fixed = list(broken.values_list('pk', flat=True))
+            now = timezone.now()
+            for start in range(0, len(fixed), BATCH_SIZE):
+                (Post.objects
+                 .filter(pk__in=fixed[start:start + BATCH_SIZE])
+                 .update(comment_count=Coalesce(Subquery(counts), 0),
+                         updated_at=now))
+        # Карточки показывают число комментариев.
+        for post_id in fixed:
+            bump_card_version('post', post_id)
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено счётчиков: {len(fixed)}'))
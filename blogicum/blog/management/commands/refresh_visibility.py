@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.visibility import refresh_visibility
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает видимость всех публикаций. Отложенные посты'
+            ' публикует воркер run_tasks; команда нужна после массовых'
+            ' изменений в обход моделей и как страховка по cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch',
+                            type=float,
+                            metavar='SECONDS',
+                            help='Повторять с указанным интервалом.')
+
+    def handle(self, *args, **options):
+        while True:
+            changed = refresh_visibility()
+            self.stdout.write(f'Изменена видимость постов: {changed}')
+            if not options['watch']:
+                return
+            time.sleep(options['watch'])
@@ -0,0 +1,50 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from blog.tasks import claim, run
+
+
+def run_in_thread(job):
+    try:
+        return run(job)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency',
+                            type=int,
+                            default=settings.BLOG_TASK_CONCURRENCY,
+                            help='Сколько задач выполнять одновременно.')
+        parser.add_argument('--poll-interval',
+                            type=float,
+                            default=1.0,
+                            help='Пауза между опросами пустой очереди, с.')
+        parser.add_argument('--once',
+                            action='store_true',
+                            help='Выполнить готовые задачи и завершиться.')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                close_old_connections()
+                jobs = claim(concurrency - len(running))
+                running.update(executor.submit(run_in_thread, job)
+                               for job in jobs)
+                if not running:
+                    if options['once']:
+                        return
+                    time.sleep(options['poll_interval'])
+                    continue
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
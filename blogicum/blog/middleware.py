@@ -0,0 +1,100 @@
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from .instrumentation import RequestMetrics, record
+from .routers import choose_replica, reset_replica, set_replica
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_UNTIL_SESSION_KEY = '_blog_primary_until'
+
+
+def rounded_now():
+    now = timezone.now()
+    granularity = settings.BLOG_CLOCK_GRANULARITY
+    if granularity <= 0:
+        return now
+    timestamp = now.timestamp()
+    return datetime.fromtimestamp(timestamp - timestamp % granularity,
+                                  tz=timezone.utc)
+
+
+def request_now(request):
+    if not hasattr(request, 'now'):
+        request.now = rounded_now()
+    return request.now
+
+
+class RequestClockMiddleware:
+    """Фиксирует текущее время один раз на запрос.
+
+    Время округляется вниз до BLOG_CLOCK_GRANULARITY секунд, поэтому
+    в пределах окна запросы к базе и ключи кэша совпадают; при нуле
+    округления нет.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.now = rounded_now()
+        return self.get_response(request)
+
+
+class ReplicaRoutingMiddleware:
+    """Отправляет чтение помеченных представлений на реплику.
+
+    После любого изменяющего запроса пользователь на
+    BLOG_REPLICA_STICKY_SECONDS закрепляется за primary, чтобы сразу
+    видеть собственные изменения, даже если реплика отстаёт.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Сброс после get_response: шаблон отрисован с той же реплики.
+        token = set_replica(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_replica(token)
+        if request.method not in SAFE_METHODS and hasattr(request, 'session'):
+            request.session[PRIMARY_UNTIL_SESSION_KEY] = (
+                time.time() + settings.BLOG_REPLICA_STICKY_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        if (request.method not in SAFE_METHODS
+                or not getattr(view, 'read_from_replica', False)):
+            return None
+        primary_until = request.session.get(PRIMARY_UNTIL_SESSION_KEY, 0)
+        if primary_until <= time.time():
+            set_replica(choose_replica())
+        return None
+
+
+class InstrumentationMiddleware:
+    """Считает запросы к базе, время SQL, шаблонов и всего ответа.
+
+    Итоги по имени представления попадают в сводку и заголовок
+    Server-Timing; превышение BLOG_QUERY_BUDGETS записывается в лог,
+    а при BLOG_QUERY_BUDGET_STRICT прерывает запрос.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with RequestMetrics() as metrics:
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is None:
+            return response
+        if settings.BLOG_SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing()
+        record(match.view_name, metrics)
+        return response
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:17
+
+import blog.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_task'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, upload_to='posts_images', validators=[blog.validators.validate_image_limits], verbose_name='Картина поста'),
+        ),
+    ]
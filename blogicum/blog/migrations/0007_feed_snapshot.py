@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=256, verbose_name='Лента')),
+                ('feed_type', models.CharField(choices=[('rss', 'RSS 2.0'), ('atom', 'Atom 1.0')], max_length=8, verbose_name='Формат')),
+                ('content', models.TextField(verbose_name='Содержимое')),
+                ('etag', models.CharField(max_length=64, verbose_name='ETag')),
+                ('last_modified', models.DateTimeField(verbose_name='Изменена')),
+                ('expires_at', models.DateTimeField(blank=True, help_text='Пусто — пока не изменятся публикации ленты.', null=True, verbose_name='Устареет')),
+            ],
+            options={
+                'verbose_name': 'снимок ленты',
+                'verbose_name_plural': 'Снимки лент',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='feedsnapshot',
+            constraint=models.UniqueConstraint(fields=('scope', 'feed_type'), name='feed_snapshot_unique'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:34
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_is_visible(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    (Post.objects.using(schema_editor.connection.alias)
+     .filter(is_published=True,
+             category__is_published=True,
+             pub_date__lte=timezone.now())
+     .update(is_visible=True))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, help_text='Опубликована, категория опубликована и дата публикации наступила.', verbose_name='Видна читателям'),
+        ),
+        migrations.RunPython(fill_is_visible, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_visible', '-pub_date'], name='post_visible_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['category', 'is_visible', '-pub_date'], name='post_visible_category_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+CATEGORY = 1
+AUTHOR = 2
+
+
+def fill_feed_entries(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    db_alias = schema_editor.connection.alias
+    posts = (Post.objects.using(db_alias)
+             .filter(is_visible=True)
+             .values_list('pk', 'category_id', 'author_id', 'pub_date'))
+    entries = []
+    for pk, category_id, author_id, pub_date in posts.iterator():
+        entries.append(FeedEntry(kind=CATEGORY, key=category_id,
+                                 post_id=pk, pub_date=pub_date))
+        entries.append(FeedEntry(kind=AUTHOR, key=author_id,
+                                 post_id=pk, pub_date=pub_date))
+    FeedEntry.objects.using(db_alias).bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Категория'), (2, 'Автор')], verbose_name='Лента')),
+                ('key', models.BigIntegerField(verbose_name='Id категории или автора')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='blog.post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Записи лент',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['kind', 'key', '-pub_date', '-id'], name='feed_entry_page_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='feedentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'key', 'post'), name='feed_entry_unique'),
+        ),
+        migrations.RunPython(fill_feed_entries, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 
-from .models import User, Post
+from .models import FeedEntry, User
+from .paginators import CursorPaginator, InvalidCursor
 
 
 class AddAuthorMixin:
@@ -14,6 +17,14 @@ class AddAuthorMixin:
 
 class UserIsAuthorMixin:
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('author')
+
+    def get_object(self, queryset=None):
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
     def dispatch(self, request, *args, **kwargs):
         if request.user == self.get_object().author:
             return super().dispatch(request, *args, **kwargs)
@@ -23,10 +34,48 @@ class UserIsAuthorMixin:
 
 class AddCommentPostInContextMixin:
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('post')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comment'] = get_object_or_404(self.model,
-                                               pk=self.kwargs['comment_id'])
-        context['post'] = get_object_or_404(Post,
-                                            pk=self.kwargs['post_id'])
+        context['comment'] = self.object
+        context['post'] = self.object.post
         return context
+
+
+class CursorPaginationMixin:
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if cursor is None and (not settings.BLOG_CURSOR_PAGINATION
+                               or self.page_kwarg in self.request.GET):
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class FeedEntryPaginationMixin:
+    """Лента по таблице FeedEntry.
+
+    Страница выбирается диапазоном по узкому индексу, а её посты
+    подгружаются одним запросом по первичному ключу из post_queryset().
+    """
+
+    post_queryset = None
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = (
+            super().paginate_queryset(queryset, page_size))
+        if queryset.model is FeedEntry:
+            posts = self.post_queryset().in_bulk(
+                [entry.post_id for entry in object_list])
+            page.object_list = object_list = [
+                posts[entry.post_id] for entry in object_list
+                if entry.post_id in posts]
+        return paginator, page, object_list, is_paginated
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .validators import validate_image_limits
+
 
 User = get_user_model()
 
@@ -40,13 +42,45 @@ class Post(AddPublishedCreatedFieldModel):
                                  verbose_name='Категория')
     image = models.ImageField('Картина поста',
                               upload_to='posts_images',
-                              blank=True)
+                              blank=True,
+                              validators=(validate_image_limits,))
+    comment_count = models.PositiveIntegerField('Количество комментариев',
+                                                default=0,
+                                                editable=False)
+    updated_at = models.DateTimeField('Изменено',
+                                      auto_now=True)
+    is_visible = models.BooleanField('Видна читателям',
+                                     default=False,
+                                     editable=False,
+                                     help_text=('Опубликована, категория'
+                                                ' опубликована и дата'
+                                                ' публикации наступила.'))
 
     class Meta:
         default_related_name = 'posts'
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = '-pub_date',
+        indexes = (
+            models.Index(fields=('author', '-pub_date'),
+                         name='post_author_feed_idx'),
+            # Django сравнивает булево поле без параметра (WHERE
+            # "is_visible"), и SQLite не может искать по нему в составном
+            # индексе, а частичный индекс с тем же условием подходит.
+            models.Index(fields=('-pub_date',),
+                         condition=models.Q(is_visible=True),
+                         name='post_visible_feed_idx'),
+            models.Index(fields=('category', '-pub_date'),
+                         condition=models.Q(is_visible=True),
+                         name='post_visible_category_idx'),
+            # Валидатор лент и срок кэша до ближайшей отложенной публикации.
+            models.Index(fields=('updated_at',),
+                         condition=models.Q(is_visible=True),
+                         name='post_visible_updated_idx'),
+            models.Index(fields=('pub_date',),
+                         condition=models.Q(is_visible=False),
+                         name='post_hidden_pub_date_idx'),
+        )
 
     def __str__(self):
         return self.title
@@ -98,6 +132,136 @@ class Comments(models.Model):
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = 'created_at',
+        indexes = (
+            models.Index(fields=('post', 'created_at'),
+                         name='comment_post_created_idx'),
+        )
 
     def __str__(self):
         return self.text
+
+
+class FeedEntry(models.Model):
+    """Строка ленты категории или автора: видимый пост и ключ сортировки."""
+
+    class Kind(models.IntegerChoices):
+        CATEGORY = 1, 'Категория'
+        AUTHOR = 2, 'Автор'
+
+    kind = models.PositiveSmallIntegerField('Лента',
+                                            choices=Kind.choices)
+    key = models.BigIntegerField('Id категории или автора')
+    post = models.ForeignKey(Post,
+                             on_delete=models.CASCADE,
+                             related_name='feed_entries',
+                             verbose_name='Пост')
+    pub_date = models.DateTimeField('Дата и время публикации')
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи лент'
+        indexes = (
+            models.Index(fields=('kind', 'key', '-pub_date', '-id'),
+                         name='feed_entry_page_idx'),
+        )
+        constraints = (
+            models.UniqueConstraint(fields=('kind', 'key', 'post'),
+                                    name='feed_entry_unique'),
+        )
+
+    def __str__(self):
+        return f'{self.get_kind_display()} {self.key}: {self.post_id}'
+
+
+class PostTerm(models.Model):
+    post = models.ForeignKey(Post,
+                             on_delete=models.CASCADE,
+                             related_name='search_terms',
+                             verbose_name='Пост')
+    term = models.CharField('Слово',
+                            max_length=64)
+    weight = models.PositiveIntegerField('Вес')
+
+    class Meta:
+        verbose_name = 'слово поискового индекса'
+        verbose_name_plural = 'Поисковый индекс'
+        constraints = (
+            models.UniqueConstraint(fields=('term', 'post'),
+                                    name='post_term_unique'),
+        )
+
+    def __str__(self):
+        return self.term
+
+
+class Task(models.Model):
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Ожидает'
+        RUNNING = 'running', 'Выполняется'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField('Задача',
+                            max_length=256)
+    args = models.JSONField('Аргументы',
+                            default=list)
+    status = models.CharField('Статус',
+                              max_length=16,
+                              choices=Status.choices,
+                              default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField('Попыток',
+                                                default=0)
+    max_attempts = models.PositiveSmallIntegerField('Максимум попыток')
+    run_after = models.DateTimeField('Выполнить после')
+    locked_at = models.DateTimeField('Взята в работу',
+                                     null=True,
+                                     blank=True)
+    last_error = models.TextField('Последняя ошибка',
+                                  blank=True)
+    created_at = models.DateTimeField('Добавлено',
+                                      auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = 'run_after',
+        indexes = (
+            models.Index(fields=('status', 'run_after'),
+                         name='task_queue_idx'),
+        )
+
+    def __str__(self):
+        return self.name
+
+
+class FeedSnapshot(models.Model):
+
+    class FeedType(models.TextChoices):
+        RSS = 'rss', 'RSS 2.0'
+        ATOM = 'atom', 'Atom 1.0'
+
+    scope = models.CharField('Лента',
+                             max_length=256)
+    feed_type = models.CharField('Формат',
+                                 max_length=8,
+                                 choices=FeedType.choices)
+    content = models.TextField('Содержимое')
+    etag = models.CharField('ETag',
+                            max_length=64)
+    last_modified = models.DateTimeField('Изменена')
+    expires_at = models.DateTimeField('Устареет',
+                                      null=True,
+                                      blank=True,
+                                      help_text=('Пусто — пока не изменятся'
+                                                 ' публикации ленты.'))
+
+    class Meta:
+        verbose_name = 'снимок ленты'
+        verbose_name_plural = 'Снимки лент'
+        constraints = (
+            models.UniqueConstraint(fields=('scope', 'feed_type'),
+                                    name='feed_snapshot_unique'),
+        )
+
+    def __str__(self):
+        return f'{self.scope} ({self.feed_type})'
@@ -0,0 +1,139 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .cache import cached_count
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class CursorPage(Sequence):
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = (paginator.encode(NEXT, object_list[-1])
+                            if has_next else None)
+        self.previous_cursor = (paginator.encode(PREVIOUS, object_list[0])
+                                if has_previous else None)
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу (field, id) без OFFSET и COUNT."""
+
+    is_cursor = True
+
+    def __init__(self, queryset, per_page, field='pub_date', descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def encode(self, direction, obj):
+        key = getattr(obj, self.field).isoformat()
+        raw = f'{direction}|{key}|{obj.pk}'
+        return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode(cursor):
+        try:
+            raw = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, key, pk = raw.decode().split('|')
+            if direction not in (NEXT, PREVIOUS):
+                raise ValueError(direction)
+            return direction, datetime.fromisoformat(key), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise InvalidCursor('Некорректный курсор страницы')
+
+    def _slice(self, key, pk, forward):
+        descending = self.descending == forward
+        lookup = 'lt' if descending else 'gt'
+        queryset = self.queryset
+        if key is not None:
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': key})
+                | Q(**{self.field: key, f'pk__{lookup}': pk}))
+        ordering = ((f'-{self.field}', '-pk') if descending
+                    else (self.field, 'pk'))
+        return list(queryset.order_by(*ordering)[:self.per_page + 1])
+
+    def page(self, cursor=None):
+        if not cursor:
+            objects = self._slice(None, None, forward=True)
+            return CursorPage(objects[:self.per_page], self,
+                              has_next=len(objects) > self.per_page,
+                              has_previous=False)
+        direction, key, pk = self.decode(cursor)
+        if direction == NEXT:
+            objects = self._slice(key, pk, forward=True)
+            return CursorPage(objects[:self.per_page], self,
+                              has_next=len(objects) > self.per_page,
+                              has_previous=bool(objects))
+        objects = self._slice(key, pk, forward=False)
+        return CursorPage(objects[:self.per_page][::-1], self,
+                          has_next=bool(objects),
+                          has_previous=len(objects) > self.per_page)
+
+
+def planner_estimate(queryset):
+    """Оценка числа строк планировщиком PostgreSQL, иначе None."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def _count(queryset):
+    threshold = settings.BLOG_PAGINATOR_ESTIMATE_THRESHOLD
+    if threshold is None:
+        return queryset.count()
+    # Точный подсчёт не дальше порога стоит не больше одной страницы ленты.
+    bounded = queryset[:threshold + 1].count()
+    if bounded <= threshold:
+        return bounded
+    estimate = planner_estimate(queryset)
+    return queryset.count() if estimate is None else max(estimate, bounded)
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который считает записи облегчённым запросом.
+
+    Из COUNT убираются сортировка, select_related и выбираемые поля,
+    итог кэшируется на BLOG_PAGINATOR_COUNT_TIMEOUT секунд, а выше
+    BLOG_PAGINATOR_ESTIMATE_THRESHOLD берётся оценка планировщика.
+    """
+
+    @cached_property
+    def count(self):
+        return cached_count(self.object_list.order_by().values('pk'),
+                            _count)
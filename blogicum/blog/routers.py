@@ -0,0 +1,48 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Алиас реплики, выбранный для текущего запроса; None — читать с primary.
+_replica = ContextVar('blog_replica', default=None)
+
+# Сессии читаются только с primary: отставшая реплика «разлогинит».
+PRIMARY_ONLY_APPS = {'sessions'}
+
+
+def read_from_replica(view):
+    """Помечает представление как только читающее (функцию или класс)."""
+    view.read_from_replica = True
+    return view
+
+
+def choose_replica():
+    replicas = settings.BLOG_DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+
+def set_replica(alias):
+    """Направляет чтение на реплику alias до вызова reset_replica."""
+    return _replica.set(alias)
+
+
+def reset_replica(token):
+    _replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Запись всегда в default, чтение — с реплики, если запрос разрешил."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return 'default'
+        return _replica.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.BLOG_DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -0,0 +1,82 @@
+import re
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from .models import Post, PostTerm
+
+TITLE_WEIGHT = 3
+TEXT_WEIGHT = 1
+MAX_QUERY_TERMS = 8
+WORD = re.compile(r'\w+')
+
+
+def tokenize(text):
+    text = text.lower().replace('ё', 'е')
+    return [word[:64] for word in WORD.findall(text) if len(word) > 1]
+
+
+def post_terms(post):
+    weights = Counter()
+    for term in tokenize(post.title):
+        weights[term] += TITLE_WEIGHT
+    for term in tokenize(post.text):
+        weights[term] += TEXT_WEIGHT
+    return weights.items()
+
+
+@transaction.atomic
+def index_post(post):
+    PostTerm.objects.filter(post_id=post.pk).delete()
+    PostTerm.objects.bulk_create(
+        PostTerm(post_id=post.pk, term=term, weight=weight)
+        for term, weight in post_terms(post))
+
+
+def insert_terms(cursor, rows):
+    """Вставляет строки (post_id, term, weight) без создания моделей."""
+    quote = connection.ops.quote_name
+    cursor.executemany(
+        f'INSERT INTO {quote(PostTerm._meta.db_table)} '
+        f'({quote("post_id")}, {quote("term")}, {quote("weight")})'
+        ' VALUES (%s, %s, %s)',
+        rows)
+
+
+@transaction.atomic
+def index_posts(posts):
+    """Индексирует пачку публикаций из строк (pk, title, text)."""
+    posts = list(posts)
+    PostTerm.objects.filter(post_id__in=[pk for pk, *_ in posts]).delete()
+    with connection.cursor() as cursor:
+        insert_terms(cursor, [
+            (pk, term, weight) for pk, title, text in posts
+            for term, weight in post_terms(Post(title=title, text=text))])
+
+
+def query_terms(query):
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def matching_posts(terms):
+    """Подзапрос id публикаций, содержащих все слова terms."""
+    return (PostTerm.objects
+            .filter(term__in=terms)
+            .values('post')
+            .annotate(matched=Count('term'))
+            .filter(matched=len(terms))
+            .values('post'))
+
+
+def search_posts(query, queryset=None):
+    """Публикации, содержащие все слова запроса, по убыванию веса."""
+    terms = query_terms(query)
+    queryset = Post.objects.all() if queryset is None else queryset
+    if not terms:
+        return queryset.none()
+    return (queryset
+            .filter(pk__in=matching_posts(terms),
+                    search_terms__term__in=terms)
+            .annotate(rank=Sum('search_terms__weight'))
+            .order_by('-rank', '-pub_date', '-pk'))
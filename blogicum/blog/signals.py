@@ -0,0 +1,166 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_card_version, purge_all_pages, purge_pages
+from .fanout import fan_out
+from .feeds import expire_feeds
+from .images import missing_variants
+from .models import Category, Comments, Location, Post, User
+from .search import index_post
+from .tasks import schedule_image_variants, schedule_visibility_refresh
+from .visibility import post_is_visible, refresh_visibility
+
+
+def post_scopes(post, *category_ids):
+    """Области страниц и лент, в которых показывается пост."""
+    slugs = (Category.objects
+             .filter(pk__in={post.category_id, *category_ids})
+             .values_list('slug', flat=True))
+    username = (User.objects
+                .filter(pk=post.author_id)
+                .values_list('username', flat=True)
+                .first())
+    return ['index',
+            f'profile:{username}',
+            *(f'category:{slug}' for slug in slugs)]
+
+
+def purge_post_pages(post, *category_ids):
+    purge_pages(f'post:{post.pk}', *post_scopes(post, *category_ids))
+
+
+@receiver(pre_save, sender=Post)
+def set_post_visibility(sender, instance, **kwargs):
+    instance.is_visible = post_is_visible(instance, timezone.now())
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_category(sender, instance, **kwargs):
+    instance._saved_category_id = (Post.objects
+                                   .filter(pk=instance.pk)
+                                   .values_list('category_id', flat=True)
+                                   .first())
+
+
+@receiver((post_save, post_delete), sender=Post)
+def post_changed(sender, instance, **kwargs):
+    bump_card_version('post', instance.pk)
+    scopes = post_scopes(instance,
+                         getattr(instance, '_saved_category_id', None))
+    purge_pages(f'post:{instance.pk}', *scopes)
+    expire_feeds(*scopes)
+
+
+@receiver(post_save, sender=Post)
+def update_feed_entries(sender, instance, update_fields=None, **kwargs):
+    fields = {'is_visible', 'pub_date', 'category', 'author'}
+    if update_fields is None or fields & set(update_fields):
+        fan_out([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'title', 'text'} & set(update_fields):
+        index_post(instance)
+
+
+@receiver(post_save, sender=Post)
+def schedule_publication(sender, instance, **kwargs):
+    """Ставит в очередь пересчёт видимости на момент публикации."""
+    if instance.is_published and not instance.is_visible:
+        schedule_visibility_refresh(instance.pk, instance.pub_date)
+
+
+@receiver(post_save, sender=Post)
+def make_image_variants(sender, instance, **kwargs):
+    if instance.image and missing_variants(instance.image):
+        schedule_image_variants(instance.pk, instance.image.name)
+
+
+@receiver(post_save, sender=Comments)
+def count_added_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        (Post.objects
+         .filter(pk=instance.post_id)
+         .update(comment_count=F('comment_count') + 1))
+
+
+@receiver(post_delete, sender=Comments)
+def count_deleted_comment(sender, instance, **kwargs):
+    # Счётчик мог разойтись (bulk_create, правки в обход модели):
+    # не даём ему уйти ниже нуля и нарушить CHECK-ограничение.
+    (Post.objects
+     .filter(pk=instance.post_id)
+     .update(comment_count=Greatest(F('comment_count') - 1, 0)))
+
+
+@receiver((post_save, post_delete), sender=Comments)
+def comment_changed(sender, instance, **kwargs):
+    bump_card_version('post', instance.post_id)
+    (Post.objects
+     .filter(pk=instance.post_id)
+     .update(updated_at=timezone.now()))
+    if Comments.post.is_cached(instance):
+        post = instance.post
+    else:
+        post = Post.objects.filter(pk=instance.post_id).first()
+    if post is not None:
+        purge_post_pages(post)
+
+
+@receiver((post_save, post_delete), sender=Category)
+def category_changed(sender, instance, created=False, **kwargs):
+    bump_card_version('category', instance.pk)
+    if not created:
+        # При удалении категории у постов остаётся category=NULL.
+        refresh_visibility(Post.objects.filter(
+            Q(category=instance.pk) | Q(category__isnull=True)))
+        purge_all_pages()
+        expire_feeds()
+
+
+@receiver((post_save, post_delete), sender=Location)
+def location_changed(sender, instance, created=False, **kwargs):
+    bump_card_version('location', instance.pk)
+    if not created:
+        purge_all_pages()
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    bump_card_version('author', instance.pk)
+    if not created:
+        purge_all_pages()
+        expire_feeds()
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.BLOG_SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def drop_unusable_connections(sender, **kwargs):
+    """Проверяет постоянные соединения до первого запроса к базе.
+
+    Django 3.2 не знает CONN_HEALTH_CHECKS и замечает оборванное
+    соединение только после ошибки, которую увидит пользователь.
+    """
+    for connection in connections.all():
+        if (connection.connection is not None
+                and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and not connection.is_usable()):
+            connection.close()
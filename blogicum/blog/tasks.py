@@ -0,0 +1,211 @@
+import base64
+import hashlib
+import logging
+import traceback
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .cache import bump_card_version, purge_pages
+from .images import make_variants, missing_variants
+from .models import Post, Task
+from .visibility import refresh_visibility
+
+logger = logging.getLogger(__name__)
+
+ABANDONED_ERROR = 'Воркер не завершил задачу за BLOG_TASK_LOCK_TIMEOUT'
+VARIANTS_TASK_KEY = 'blog:variants-task:{image}'
+VISIBILITY_TASK_KEY = 'blog:visibility-task:{post_id}:{pub_date}'
+
+
+def enqueue(name, *args, delay=0):
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        max_attempts=settings.BLOG_TASK_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay))
+
+
+def task(func):
+    """Регистрирует функцию как фоновую задачу: func.delay(*args)."""
+    name = f'{func.__module__}.{func.__qualname__}'
+
+    @wraps(func)
+    def delay(*args, **kwargs):
+        return enqueue(name, *args, **kwargs)
+
+    func.delay = delay
+    return func
+
+
+def claim(limit):
+    """Забирает до limit готовых задач; каждую получает один воркер."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.BLOG_TASK_LOCK_TIMEOUT)
+    # Воркер, не закончивший задачу, мог упасть на ней самой: это
+    # неудачная попытка, иначе такая задача повторялась бы бесконечно.
+    abandoned = Task.objects.filter(status=Task.Status.RUNNING,
+                                    locked_at__lt=stale)
+    failed = (abandoned
+              .filter(attempts__gte=F('max_attempts') - 1)
+              .update(status=Task.Status.FAILED,
+                      attempts=F('attempts') + 1,
+                      last_error=ABANDONED_ERROR,
+                      locked_at=None))
+    if failed:
+        logger.error('Брошенных задач не выполнено: %s', failed)
+    abandoned.update(status=Task.Status.PENDING,
+                     attempts=F('attempts') + 1,
+                     last_error=ABANDONED_ERROR,
+                     locked_at=None)
+    candidates = (Task.objects
+                  .filter(status=Task.Status.PENDING, run_after__lte=now)
+                  .values_list('pk', flat=True)[:limit])
+    claimed = []
+    for pk in candidates:
+        taken = (Task.objects
+                 .filter(pk=pk, status=Task.Status.PENDING)
+                 .update(status=Task.Status.RUNNING, locked_at=now))
+        if taken:
+            claimed.append(pk)
+    return list(Task.objects.filter(pk__in=claimed))
+
+
+def run(job):
+    try:
+        import_string(job.name)(*job.args)
+    except Exception:
+        job.attempts += 1
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Task.Status.FAILED
+            logger.error('Задача %s #%s не выполнена', job.name, job.pk)
+        else:
+            job.status = Task.Status.PENDING
+            backoff = settings.BLOG_TASK_RETRY_DELAY * 2 ** (job.attempts - 1)
+            job.run_after = timezone.now() + timedelta(seconds=backoff)
+        job.locked_at = None
+        job.save(update_fields=('attempts', 'last_error', 'status',
+                                'run_after', 'locked_at'))
+        return False
+    job.delete()
+    return True
+
+
+@task
+def make_post_image_variants(post_id):
+    post = (Post.objects
+            .filter(pk=post_id)
+            .select_related('author', 'category')
+            .first())
+    if post is None or not post.image:
+        return
+    cache.delete(_variants_task_key(post.image.name))
+    if not missing_variants(post.image):
+        return
+    make_variants(post.image)
+    # Карточки и страницы, отрисованные до этого, ссылаются на оригинал.
+    # Кэш воркера может быть своим, поэтому карточку сбрасывает updated_at.
+    Post.objects.filter(pk=post.pk).update(updated_at=timezone.now())
+    bump_card_version('post', post.pk)
+    scopes = [f'post:{post.pk}', 'index', f'profile:{post.author.username}']
+    if post.category is not None:
+        scopes.append(f'category:{post.category.slug}')
+    purge_pages(*scopes)
+
+
+def _variants_task_key(image_name):
+    # Ключ по имени файла: id поста после отката транзакции может
+    # достаться другому посту, а имя файла в хранилище — нет.
+    image = hashlib.md5(image_name.encode()).hexdigest()
+    return VARIANTS_TASK_KEY.format(image=image)
+
+
+def schedule_image_variants(post_id, image_name):
+    """Ставит задачу создания копий, если она ещё не в очереди."""
+    if cache.add(_variants_task_key(image_name), True,
+                 timeout=settings.BLOG_TASK_LOCK_TIMEOUT):
+        make_post_image_variants.delay(post_id)
+
+
+@task
+def refresh_post_visibility(post_id):
+    refresh_visibility(Post.objects.filter(pk=post_id))
+
+
+def schedule_visibility_refresh(post_id, pub_date):
+    """Ставит пересчёт видимости поста на pub_date, если его ещё нет.
+
+    Повторные сохранения поста с той же датой не плодят задачи; задача
+    на прежнюю дату после переноса ничего не меняет.
+    """
+    delay = (pub_date - timezone.now()).total_seconds()
+    if delay <= 0:
+        return
+    key = VISIBILITY_TASK_KEY.format(post_id=post_id,
+                                     pub_date=pub_date.timestamp())
+    if cache.add(key, True,
+                 timeout=delay + settings.BLOG_TASK_LOCK_TIMEOUT):
+        refresh_post_visibility.delay(post_id, delay=delay)
+
+
+def schedule_publications(posts):
+    """Ставит пересчёт видимости отложенным постам из posts.
+
+    Для загрузок в обход сигналов: сохранение поста делает то же
+    самое в schedule_publication.
+    """
+    pending = (posts
+               .filter(is_published=True, is_visible=False,
+                       pub_date__gt=timezone.now())
+               .values_list('pk', 'pub_date'))
+    for post_id, pub_date in pending.iterator():
+        schedule_visibility_refresh(post_id, pub_date)
+
+
+def encode_attachment(attachment):
+    """Вложение (filename, content, mimetype) в виде, пригодном для JSON."""
+    if not isinstance(attachment, tuple):
+        raise ValueError('Очередь писем принимает только вложения вида'
+                         ' (filename, content, mimetype)')
+    filename, content, mimetype = attachment
+    is_text = isinstance(content, str)
+    if is_text:
+        content = content.encode()
+    return {'filename': filename,
+            'content': base64.b64encode(content).decode('ascii'),
+            'mimetype': mimetype,
+            'text': is_text}
+
+
+def decode_attachment(attachment):
+    content = base64.b64decode(attachment['content'])
+    if attachment['text']:
+        content = content.decode()
+    return attachment['filename'], content, attachment['mimetype']
+
+
+@task
+def send_email(message):
+    email = EmailMultiAlternatives(
+        subject=message['subject'],
+        body=message['body'],
+        from_email=message['from_email'],
+        to=message['to'],
+        cc=message['cc'],
+        bcc=message['bcc'],
+        reply_to=message['reply_to'],
+        headers=message['headers'],
+        alternatives=[tuple(alternative)
+                      for alternative in message['alternatives']],
+        attachments=[decode_attachment(attachment)
+                     for attachment in message.get('attachments', [])])
+    connection = get_connection(settings.BLOG_TASK_EMAIL_BACKEND,
+                                fail_silently=False)
+    connection.send_messages([email])
@@ -0,0 +1,21 @@
+from django import template
+
+from blog.cache import card_version as _card_version
+from blog.images import get_variant
+from blog.tasks import schedule_image_variants
+
+register = template.Library()
+
+
+@register.filter
+def card_version(post):
+    return _card_version(post)
+
+
+@register.filter
+def image_variant(image_file, variant):
+    image = get_variant(image_file, variant)
+    if image.width is None and image_file.instance.pk is not None:
+        # Копии создаёт run_tasks, а не запрос, который их показывает.
+        schedule_image_variants(image_file.instance.pk, image_file.name)
+    return image
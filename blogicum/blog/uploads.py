@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Пишет загрузку во временный файл частями и не дальше предела.
+
+    Байты сверх BLOG_MAX_IMAGE_SIZE отбрасываются, а size файла
+    сохраняет полный размер, чтобы валидатор отклонил его.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.BLOG_MAX_IMAGE_SIZE:
+            return None
+        return super().receive_data_chunk(raw_data, start)
@@ -9,6 +9,10 @@ urlpatterns = [
          views.IndexListView.as_view(),
          name='index'
          ),
+    path('feed/<str:feed_type>/',
+         views.index_feed,
+         name='index_feed'
+         ),
     path('posts/create/',
          views.PostCreateView.as_view(),
          name='create_post'
@@ -37,10 +41,30 @@ urlpatterns = [
          views.post_detail,
          name='post_detail'
          ),
+    path('posts/<int:post_id>/comments/',
+         views.post_comments,
+         name='post_comments'
+         ),
     path('category/<slug:category_slug>/',
          views.CategoryListViev.as_view(),
          name='category_posts'
          ),
+    path('category/<slug:category_slug>/feed/<str:feed_type>/',
+         views.category_feed,
+         name='category_feed'
+         ),
+    path('search/',
+         views.SearchListView.as_view(),
+         name='search'
+         ),
+    path('stats/',
+         views.instrumentation_stats,
+         name='instrumentation_stats'
+         ),
+    path('export/<str:kind>/',
+         views.export,
+         name='export'
+         ),
     path('profile/edit/',
          views.edit_profile,
          name='edit_profile'
@@ -49,4 +73,8 @@ urlpatterns = [
          views.ProfileListViev.as_view(),
          name='profile'
          ),
+    path('profile/<slug:username>/feed/<str:feed_type>/',
+         views.profile_feed,
+         name='profile_feed'
+         ),
 ]
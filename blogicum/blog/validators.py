@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.images import get_image_dimensions
+from django.template.defaultfilters import filesizeformat
+
+
+def validate_image_limits(image):
+    """Проверяет размер файла и изображения, не декодируя пиксели.
+
+    Ширина и высота читаются только из заголовка файла.
+    """
+    if getattr(image, '_committed', False):
+        # Уже сохранённый файл был проверен при загрузке.
+        return
+    max_size = settings.BLOG_MAX_IMAGE_SIZE
+    if image.size > max_size:
+        raise ValidationError(
+            'Размер файла не должен превышать %(max_size)s.',
+            code='file_too_large',
+            params={'max_size': filesizeformat(max_size)})
+    width, height = get_image_dimensions(image)
+    if width and height and width * height > settings.BLOG_MAX_IMAGE_PIXELS:
+        raise ValidationError(
+            'Изображение %(width)s×%(height)s слишком велико.',
+            code='image_too_large',
+            params={'width': width, 'height': height})
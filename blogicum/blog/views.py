@@ -1,66 +1,118 @@
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
-from django.http import Http404
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Max
+from django.http import (Http404,
+                         HttpResponseBadRequest,
+                         JsonResponse,
+                         QueryDict,
+                         StreamingHttpResponse)
 from django.shortcuts import (render,
                               get_object_or_404,
                               redirect,
                               reverse)
 from django.urls import reverse_lazy
-from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import require_safe
 from django.views.generic import (CreateView,
                                   ListView,
                                   DeleteView,
                                   UpdateView,)
 
+from .cache import cache_page_for_anonymous, conditional_page
+from .exports import CONTENT_TYPES, EXPORTS, export_lines, parse_since
+from .feeds import feed_response
 from .forms import UserForm, CommentsForm, PostForm
+from .instrumentation import view_stats
 from .mixins import (AddAuthorMixin,
                      UserIsAuthorMixin,
-                     AddCommentPostInContextMixin)
-from .models import Post, Category, Comments, User
+                     AddCommentPostInContextMixin,
+                     CursorPaginationMixin,
+                     FeedEntryPaginationMixin)
+from .models import Post, Category, Comments, FeedEntry, User
+from .paginators import CachedCountPaginator, CursorPaginator, InvalidCursor
+from .routers import read_from_replica
+from .search import search_posts
 
 
 POST_ON_PAGE = 10
+COMMENTS_ON_PAGE = 50
 SORT_BY_PUBLISH_DATE = '-pub_date'
 SORT_BY_CREATED_DATE = 'created_at'
 
 
-def now():
-    return timezone.now()
-
-
 def query():
     return (Post.objects
             .select_related('author', 'location', 'category')
             .order_by(SORT_BY_PUBLISH_DATE)
-            .annotate(comment_count=Count('comments'))
             )
 
 
-class ProfileListViev(AddAuthorMixin, ListView):
+def visible_posts(**filters):
+    return query().filter(is_visible=True, **filters)
+
+
+def latest_change(request, **filters):
+    """Время последнего изменения видимых постов — валидатор ленты.
+
+    Воркер, публикуя отложенный пост, тоже обновляет updated_at, поэтому
+    значение меняется и там, куда сброс его кэша не дошёл.
+    """
+    return (Post.objects
+            .filter(is_visible=True, **filters)
+            .aggregate(latest=Max('updated_at'))['latest'])
+
+
+def scheduled_posts(**filters):
+    """Опубликованные посты, которые ещё не видны только из-за даты."""
+    return Post.objects.filter(is_published=True,
+                               is_visible=False,
+                               category__is_published=True,
+                               **filters)
+
+
+def feed_entries(kind, key):
+    return (FeedEntry.objects
+            .filter(kind=kind, key=key)
+            .order_by(SORT_BY_PUBLISH_DATE, '-pk'))
+
+
+def post_modified(request, post_id):
+    return (Post.objects
+            .filter(pk=post_id)
+            .values_list('updated_at', flat=True)
+            .first())
+
+
+@method_decorator(conditional_page(
+    'profile:{username}',
+    modified=lambda request, username: latest_change(
+        request, author__username=username)
+), name='dispatch')
+@read_from_replica
+class ProfileListViev(AddAuthorMixin,
+                      FeedEntryPaginationMixin,
+                      CursorPaginationMixin,
+                      ListView):
     model = Post
     template_name = 'blog/profile.html'
     slug_field = 'username'
     slug_url_kwarg = 'username'
     paginate_by = POST_ON_PAGE
+    paginator_class = CachedCountPaginator
+    post_queryset = staticmethod(query)
 
     def get_queryset(self):
         if self.request.user == self.author:
-            queryset = (query()
-                        .filter(author__username=self.kwargs['username'],))
-        else:
-            queryset = (query()
-                        .filter(author__username=self.kwargs['username'],
-                                is_published=True,
-                                category__is_published=True,
-                                pub_date__lt=now()))
-        return queryset
+            # Автор видит и черновики, которых нет в таблице ленты.
+            return query().filter(author=self.author)
+        return feed_entries(FeedEntry.Kind.AUTHOR, self.author.pk)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = get_object_or_404(
-            User,
-            username=self.kwargs['username'])
+        context['profile'] = self.author
         return context
 
 
@@ -74,6 +126,8 @@ class AddCommentCreateView(LoginRequiredMixin, CreateView):
         self.posts = get_object_or_404(Post, pk=kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
 
+    # Счётчик комментариев обновляется сигналом в той же транзакции.
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post = self.posts
@@ -117,6 +171,10 @@ class CommentDeleteView(LoginRequiredMixin,
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        return super().delete(request, *args, **kwargs)
+
     def get_success_url(self):
         return reverse('blog:post_detail',
                        kwargs={'post_id': self.kwargs['post_id']})
@@ -136,52 +194,97 @@ class PostCreateView(LoginRequiredMixin, CreateView):
                        kwargs={'username': self.object.author.username})
 
 
-class IndexListView(ListView):
+@method_decorator(conditional_page('index', modified=latest_change),
+                  name='dispatch')
+@method_decorator(cache_page_for_anonymous('index',
+                                           scheduled=scheduled_posts),
+                  name='dispatch')
+@read_from_replica
+class IndexListView(CursorPaginationMixin, ListView):
     model = Post
-    queryset = query().filter(is_published=True,
-                              pub_date__lt=now(),
-                              category__is_published=True)
     template_name = 'blog/index.html'
     paginate_by = POST_ON_PAGE
+    paginator_class = CachedCountPaginator
+
+    def get_queryset(self):
+        return visible_posts()
+
+
+def get_visible_post(request, post_id):
+    post = get_object_or_404(query(), pk=post_id)
+    if not post.is_visible and request.user != post.author:
+        raise Http404('Страница поста не найдена')
+    return post
+
+
+def comments_page(request, post):
+    paginator = CursorPaginator(Comments.objects
+                                .select_related('author')
+                                .filter(post=post),
+                                COMMENTS_ON_PAGE,
+                                field=SORT_BY_CREATED_DATE,
+                                descending=False)
+    try:
+        return paginator.page(request.GET.get('cursor'))
+    except InvalidCursor as error:
+        raise Http404(str(error))
 
 
+@read_from_replica
+@conditional_page('post:{post_id}', modified=post_modified)
+@cache_page_for_anonymous('post:{post_id}')
 def post_detail(request, post_id):
     template = 'blog/detail.html'
-    post = get_object_or_404(Post, pk=post_id)
-    if ((not post.is_published
-         or not post.category.is_published
-         or post.pub_date >= now())
-       and request.user != post.author):
-        raise Http404('Страница поста не найдена')
-    comments = (Comments.objects
-                .filter(post__id=post_id)
-                .order_by(SORT_BY_CREATED_DATE))
+    post = get_visible_post(request, post_id)
     context = {'post': post,
                'form': CommentsForm(),
-               'comments': comments}
+               'comments': comments_page(request, post)}
+    return render(request, template, context)
+
+
+@read_from_replica
+@conditional_page('post:{post_id}', modified=post_modified)
+@cache_page_for_anonymous('post:{post_id}')
+def post_comments(request, post_id):
+    template = 'includes/comment_list.html'
+    post = get_visible_post(request, post_id)
+    context = {'post': post,
+               'comments': comments_page(request, post)}
     return render(request, template, context)
 
 
-class CategoryListViev(ListView):
+@method_decorator(conditional_page(
+    'category:{category_slug}',
+    modified=lambda request, category_slug: latest_change(
+        request, category__slug=category_slug)
+), name='dispatch')
+@method_decorator(cache_page_for_anonymous(
+    'category:{category_slug}',
+    scheduled=lambda category_slug: scheduled_posts(
+        category__slug=category_slug)
+), name='dispatch')
+@read_from_replica
+class CategoryListViev(FeedEntryPaginationMixin,
+                       CursorPaginationMixin,
+                       ListView):
     model = Post
     template_name = 'blog/category.html'
     slug_field = 'category__slug'
     slug_url_kwarg = 'category_slug'
     paginate_by = POST_ON_PAGE
+    paginator_class = CachedCountPaginator
+    post_queryset = staticmethod(query)
 
     def get_queryset(self):
-        return (query().filter(category__slug=self.kwargs['category_slug'],
-                               pub_date__lt=now(),
-                               is_published=True,
-                               category__is_published=True))
+        self.category = get_object_or_404(
+            Category,
+            slug=self.kwargs['category_slug'],
+            is_published=True)
+        return feed_entries(FeedEntry.Kind.CATEGORY, self.category.pk)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True,
-            created_at__lt=now())
+        context['category'] = self.category
         return context
 
 
@@ -208,13 +311,94 @@ class PostDeleteView(LoginRequiredMixin, UserIsAuthorMixin, DeleteView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        instance = self.get_object()
         form = PostForm(self.request.POST or None,
-                        instance=instance)
+                        instance=self.object)
         context['form'] = form
         return context
 
     def get_queryset(self):
         return (super()
                 .get_queryset()
+                .select_related('location')
                 .filter(id=self.kwargs['post_id']))
+
+
+@read_from_replica
+class SearchListView(ListView):
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = POST_ON_PAGE
+
+    def get_queryset(self):
+        return search_posts(self.request.GET.get('q', ''),
+                            visible_posts())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page_query = QueryDict(mutable=True)
+        page_query['q'] = self.request.GET.get('q', '')
+        context['q'] = page_query['q']
+        context['page_query'] = '&' + page_query.urlencode()
+        return context
+
+
+@require_safe
+def index_feed(request, feed_type):
+    return feed_response(
+        request, feed_type, 'index',
+        lambda: ('Блогикум', reverse('blog:index'), visible_posts()))
+
+
+@require_safe
+def category_feed(request, category_slug, feed_type):
+    def source():
+        category = get_object_or_404(Category,
+                                     slug=category_slug,
+                                     is_published=True)
+        return (category.title,
+                reverse('blog:category_posts', args=(category_slug,)),
+                visible_posts(category=category))
+
+    return feed_response(request, feed_type, f'category:{category_slug}',
+                         source)
+
+
+@require_safe
+def profile_feed(request, username, feed_type):
+    def source():
+        author = get_object_or_404(User, username=username)
+        return (author.get_full_name() or author.get_username(),
+                reverse('blog:profile', args=(username,)),
+                visible_posts(author=author))
+
+    return feed_response(request, feed_type, f'profile:{username}', source)
+
+
+@staff_member_required
+@require_safe
+def instrumentation_stats(request):
+    return JsonResponse(view_stats(), json_dumps_params={'indent': 2})
+
+
+@staff_member_required
+@require_safe
+def export(request, kind):
+    if kind not in EXPORTS:
+        raise Http404
+    model = EXPORTS[kind].model
+    if not request.user.has_perm(
+            f'{model._meta.app_label}.view_{model._meta.model_name}'):
+        raise PermissionDenied
+    format = request.GET.get('format', 'jsonl')
+    if format not in CONTENT_TYPES:
+        return HttpResponseBadRequest('Неизвестный формат')
+    try:
+        since = (parse_since(request.GET['since'])
+                 if request.GET.get('since') else None)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    response = StreamingHttpResponse(export_lines(kind, format, since),
+                                     content_type=CONTENT_TYPES[format])
+    response['Content-Disposition'] = (
+        f'attachment; filename="{kind}.{format}"')
+    return response
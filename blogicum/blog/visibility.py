@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import purge_pages
+from .fanout import fan_out
+from .feeds import expire_feeds
+from .models import Category, Post
+
+BATCH_SIZE = 500
+
+
+def visible_q(now):
+    return Q(is_published=True,
+             category__is_published=True,
+             pub_date__lte=now)
+
+
+def post_is_visible(post, now):
+    if not post.is_published or post.pub_date > now:
+        return False
+    if Post.category.is_cached(post):
+        return post.category is not None and post.category.is_published
+    return Category.objects.filter(pk=post.category_id,
+                                   is_published=True).exists()
+
+
+def refresh_visibility(posts=None):
+    """Пересчитывает is_visible и сбрасывает кэши изменившихся постов.
+
+    У изменившихся постов обновляется и updated_at: по нему ленты
+    в других процессах узнают о смене видимости. Возвращает число
+    постов, которые появились в лентах или пропали из них.
+    """
+    now = timezone.now()
+    visible = visible_q(now)
+    # Без явной проверки NULL отрицание отбросит посты без категории.
+    hidden = ~visible | Q(category__isnull=True)
+    posts = Post.objects.all() if posts is None else posts
+    changed = list(posts
+                   .filter((visible & Q(is_visible=False))
+                           | (hidden & Q(is_visible=True)))
+                   .values_list('pk', 'is_visible',
+                                'category__slug', 'author__username'))
+    scopes = {'index'}
+    with transaction.atomic():
+        for start in range(0, len(changed), BATCH_SIZE):
+            batch = changed[start:start + BATCH_SIZE]
+            for was_visible, condition in ((False, visible),
+                                           (True, hidden)):
+                (Post.objects
+                 .filter(condition,
+                         pk__in=[pk for pk, is_visible, *_ in batch
+                                 if is_visible == was_visible])
+                 .update(is_visible=not was_visible, updated_at=now))
+            fan_out(pk for pk, *_ in batch)
+            for pk, _, slug, username in batch:
+                scopes.update((f'post:{pk}',
+                               f'category:{slug}',
+                               f'profile:{username}'))
+    if changed:
+        purge_pages(*scopes)
+        expire_feeds(*scopes)
+    return len(changed)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,13 +44,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.middleware.RequestClockMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -58,7 +62,7 @@ TEMPLATES_DIR = BASE_DIR / 'templates'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'blog.instrumentation.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR, ],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -85,6 +89,32 @@ DATABASES = {
     }
 }
 
+# Read replicas, comma-separated database names in BLOG_DB_REPLICAS, on
+# the default engine unless BLOG_DB_REPLICA_ENGINE says otherwise.
+# Views marked with blog.routers.read_from_replica read from them.
+BLOG_DATABASE_REPLICAS = []
+for number, name in enumerate(
+        filter(None, os.environ.get('BLOG_DB_REPLICAS', '').split(',')),
+        start=1):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': os.environ.get('BLOG_DB_REPLICA_ENGINE',
+                                 DATABASES['default']['ENGINE']),
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    BLOG_DATABASE_REPLICAS.append(f'replica{number}')
+# Scratch database for the bench_* commands (--database bench).
+if os.environ.get('BLOG_BENCH_DB'):
+    DATABASES['bench'] = {
+        'ENGINE': DATABASES['default']['ENGINE'],
+        'NAME': os.environ['BLOG_BENCH_DB'],
+    }
+DATABASE_ROUTERS = ['blog.routers.PrimaryReplicaRouter']
+# After a write the user reads from the primary for this many seconds.
+BLOG_REPLICA_STICKY_SECONDS = 10
+# PRAGMA name -> value applied to every new SQLite connection.
+BLOG_SQLITE_PRAGMAS = {}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -136,7 +166,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'blog.mail.QueuedEmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 LOGIN_REDIRECT_URL = 'blog:index'
@@ -144,3 +174,54 @@ LOGIN_URL = 'login'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = 'media/'
+
+# Uploads always stream to a temporary file, never into memory.
+FILE_UPLOAD_HANDLERS = [
+    'blog.uploads.LimitedTemporaryFileUploadHandler',
+]
+BLOG_MAX_IMAGE_SIZE = 20 * 1024 * 1024
+BLOG_MAX_IMAGE_PIXELS = 50_000_000
+
+# Keyset pagination links (?cursor=) in feeds instead of ?page= numbers.
+BLOG_CURSOR_PAGINATION = False
+
+# Feed paginator totals are cached for this many seconds; above the
+# threshold PostgreSQL's planner estimate is used (None: always exact).
+BLOG_PAGINATOR_COUNT_TIMEOUT = 60
+BLOG_PAGINATOR_ESTIMATE_THRESHOLD = None
+
+# Upper bound for anonymous page cache entries, in seconds.
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
+
+# "Now" is shared by the whole request and rounded down to this many
+# seconds, so scheduled-post filters produce identical queries per window.
+# 0 turns rounding off.
+BLOG_CLOCK_GRANULARITY = 60
+
+# Background task queue (python manage.py run_tasks).
+BLOG_TASK_CONCURRENCY = 2
+BLOG_TASK_MAX_ATTEMPTS = 5
+# Retry backoff: delay * 2 ** (attempt - 1) seconds.
+BLOG_TASK_RETRY_DELAY = 30
+# Running tasks older than this are considered abandoned and retried.
+BLOG_TASK_LOCK_TIMEOUT = 60 * 10
+# Backend that actually delivers mail queued by EMAIL_BACKEND.
+BLOG_TASK_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+# Per-view SQL and timing instrumentation; budgets are keyed by view
+# name, None means unlimited. Over-budget views are logged, or fail
+# the request when strict (the test suite runs strict).
+BLOG_SERVER_TIMING = True
+BLOG_QUERY_BUDGET_DEFAULT = 30
+BLOG_QUERY_BUDGETS = {
+    'blog:index': 6,
+    'blog:category_posts': 8,
+    'blog:profile': 8,
+    'blog:post_detail': 8,
+    'blog:post_comments': 6,
+    'blog:search': 6,
+    'blog:index_feed': 12,
+    'blog:category_feed': 12,
+    'blog:profile_feed': 12,
+}
+BLOG_QUERY_BUDGET_STRICT = False
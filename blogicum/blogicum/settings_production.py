@@ -0,0 +1,49 @@
+"""Production profile: DJANGO_SETTINGS_MODULE=blogicum.settings_production."""
+
+import os
+
+from .settings import *  # noqa: F401, F403
+from .settings import BASE_DIR, DATABASES
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', '127.0.0.1').split(',')
+
+# Keep connections open between requests; check them before reuse.
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = 600
+    database['CONN_HEALTH_CHECKS'] = True
+
+# Page, card and count caches are invalidated by bumping versions in the
+# cache, so every web process and the run_tasks worker must share it:
+# memcached servers from BLOG_MEMCACHED (needs pymemcache), otherwise
+# files on this host.
+if os.environ.get('BLOG_MEMCACHED'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['BLOG_MEMCACHED'].split(','),
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('BLOG_CACHE_DIR', BASE_DIR / 'cache'),
+            'OPTIONS': {'MAX_ENTRIES': 100_000},
+        },
+    }
+
+# Readers never block the writer in WAL mode; NORMAL is durable enough
+# with WAL, and a busy writer is waited for instead of failing at once.
+BLOG_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5_000,
+}
+
+# Timings stay in the log and the staff-only stats page.
+BLOG_SERVER_TIMING = False
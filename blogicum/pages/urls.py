@@ -1,13 +1,17 @@
 from django.urls import path
 from django.views.generic import TemplateView
 
+from blog.routers import read_from_replica
+
 app_name = 'pages'
 
 urlpatterns = [
     path('about/',
-         TemplateView.as_view(template_name='pages/about.html'),
+         read_from_replica(
+             TemplateView.as_view(template_name='pages/about.html')),
          name='about'),
     path('rules/',
-         TemplateView.as_view(template_name='pages/rules.html'),
+         read_from_replica(
+             TemplateView.as_view(template_name='pages/rules.html')),
          name='rules',),
 ]
@@ -41,6 +41,12 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def enforce_query_budgets():
+    with override_settings(BLOG_QUERY_BUDGET_STRICT=True):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -92,6 +98,7 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.databases",
     "adapters.comment",
 ]
 
@@ -0,0 +1,21 @@
+import pytest
+from django.db import connections
+
+BENCH = 'bench'
+
+
+@pytest.fixture
+def bench_alias(db, tmp_path):
+    """Отдельная SQLite-база в файле для команд bench_*."""
+    connections.databases[BENCH] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'bench.sqlite3'),
+    }
+    connections.ensure_defaults(BENCH)
+    connections.prepare_test_settings(BENCH)
+    try:
+        yield BENCH
+    finally:
+        connections[BENCH].close()
+        del connections[BENCH]
+        del connections.databases[BENCH]
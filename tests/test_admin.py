@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as context:
+        assert admin_client.get(url).status_code == 200
+    return len(context)
+
+
+def blend_rows(mixer, count):
+    for _ in range(count):
+        post = mixer.blend('blog.Post',
+                           author=mixer.blend('auth.User'),
+                           category=mixer.blend('blog.Category'),
+                           location=mixer.blend('blog.Location'),
+                           pub_date=timezone.now() - timedelta(days=1))
+        mixer.blend('blog.Comments', post=post,
+                    author=mixer.blend('auth.User'))
+
+
+@pytest.mark.parametrize('url', ('/admin/blog/post/',
+                                 '/admin/blog/comments/'))
+def test_changelist_queries_do_not_grow_with_rows(mixer, admin_client, url):
+    blend_rows(mixer, 2)
+    few = changelist_queries(admin_client, url)
+    blend_rows(mixer, 8)
+    assert changelist_queries(admin_client, url) == few, (
+        "Убедитесь, что список в админке загружает связанные объекты"
+        " одним запросом (list_select_related)."
+    )
+
+
+def test_post_form_does_not_list_all_related_objects(mixer, admin_client):
+    users = mixer.cycle(5).blend('auth.User')
+    response = admin_client.get('/admin/blog/post/add/')
+    content = response.content.decode()
+    assert 'vForeignKeyRawIdAdminField' in content, (
+        "Убедитесь, что автор публикации выбирается по id, а не из"
+        " выпадающего списка всех пользователей."
+    )
+    assert f'<option value="{users[0].pk}"' not in content
+    assert 'admin-autocomplete' in content
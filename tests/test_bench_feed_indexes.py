@@ -0,0 +1,29 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_bench_feed_indexes_refuses_default_database():
+    with pytest.raises(CommandError):
+        call_command('bench_feed_indexes', posts=10, database='default',
+                     stdout=StringIO())
+    assert not Post.objects.exists(), (
+        "Убедитесь, что бенчмарк не заполняет основную базу."
+    )
+
+
+def test_bench_feed_indexes_uses_separate_database(bench_alias):
+    stdout = StringIO()
+    call_command('bench_feed_indexes', posts=50, authors=3, categories=2,
+                 repeat=1, database=bench_alias, stdout=stdout)
+    assert 'С индексами' in stdout.getvalue()
+    assert not Post.objects.exists(), (
+        "Убедитесь, что бенчмарк заполняет только базу из --database."
+    )
+    assert Post.objects.using(bench_alias).count() == 50
@@ -0,0 +1,47 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_bench_routes_refuses_default_database():
+    with pytest.raises(CommandError):
+        call_command('bench_routes', posts=10, database='default',
+                     stdout=StringIO())
+    assert not Post.objects.exists(), (
+        "Убедитесь, что бенчмарк не заполняет основную базу."
+    )
+
+
+def test_bench_routes_covers_every_named_url(
+        tmp_path, settings, bench_alias):
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    output = tmp_path / 'routes.json'
+    cache.set('рабочий ключ', 1)
+    call_command('bench_routes', users=5, categories=3, locations=2,
+                 posts=30, comments=60, images=3, requests=2,
+                 no_cache=True, database=bench_alias,
+                 output=str(output), stdout=StringIO())
+    assert not Post.objects.exists() and cache.get('рабочий ключ') == 1, (
+        "Убедитесь, что бенчмарк не трогает основные базу и кэш."
+    )
+    results = json.loads(output.read_text())
+    routes = results['routes']
+    for name in ('blog:index', 'blog:post_detail', 'blog:category_posts',
+                 'blog:profile', 'blog:edit_post', 'blog:search',
+                 'blog:index_feed', 'pages:about', 'pages:rules'):
+        assert name in routes, (
+            f"Убедитесь, что бенчмарк замеряет адрес {name}."
+        )
+    for name in ('blog:index', 'blog:post_detail', 'blog:profile'):
+        assert routes[name]['anonymous']['statuses'] == [200]
+    assert routes['blog:edit_post']['author']['statuses'] == [200]
+    stats = routes['blog:index']['anonymous']
+    assert stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms']
@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+from django.db.models.signals import post_save
+
+from blog.models import Comments, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_views(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    for i in range(3):
+        user_client.post(f'/posts/{post.id}/comment/',
+                         data={'text': f'Comment {i}'})
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при добавлении комментария увеличивается счётчик"
+        " комментариев публикации."
+    )
+    comment = post.comments.first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при удалении комментария уменьшается счётчик"
+        " комментариев публикации."
+    )
+
+
+def test_recount_comments_repairs_counters(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(4).blend('blog.Comments', post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    call_command('recount_comments')
+    post.refresh_from_db()
+    assert post.comment_count == 4, (
+        "Убедитесь, что команда `recount_comments` восстанавливает"
+        " счётчики комментариев."
+    )
+
+
+def test_comment_count_follows_any_save_or_delete(
+        user, user_client, post_with_published_location):
+    post = post_with_published_location
+    comment = Comments.objects.create(post=post, author=user, text='Из shell')
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик комментариев обновляется при любом"
+        " сохранении комментария, а не только в представлениях."
+    )
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    response = user_client.post(
+        f'/posts/{post.id}/delete_comment/{comment.id}/')
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что счётчик комментариев не уходит ниже нуля."
+    )
+
+
+class CommentSaveFailed(Exception):
+    pass
+
+
+def fail_comment_save(sender, instance, created, **kwargs):
+    raise CommentSaveFailed
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_and_counter_commit_together(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    post_save.connect(fail_comment_save, sender=Comments)
+    try:
+        with pytest.raises(CommentSaveFailed):
+            user_client.post(f'/posts/{post.id}/comment/',
+                             data={'text': 'Не сохранится'})
+    finally:
+        post_save.disconnect(fail_comment_save, sender=Comments)
+    post.refresh_from_db()
+    assert (post.comment_count, post.comments.count()) == (0, 0), (
+        "Убедитесь, что комментарий и счётчик комментариев сохраняются"
+        " в одной транзакции."
+    )
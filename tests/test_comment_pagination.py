@@ -0,0 +1,29 @@
+import pytest
+
+from blog.views import COMMENTS_ON_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comments_are_paginated_by_cursor(
+        mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(COMMENTS_ON_PAGE + 5).blend('blog.Comments', post=post)
+    response = user_client.get(f'/posts/{post.id}/')
+    first_page = response.context['comments']
+    assert len(first_page) == COMMENTS_ON_PAGE, (
+        "Убедитесь, что на странице поста выводится только первая страница"
+        " комментариев."
+    )
+    assert first_page.has_next()
+    response = user_client.get(f'/posts/{post.id}/comments/',
+                               {'cursor': first_page.next_cursor})
+    rest = response.context['comments']
+    assert len(rest) == 5 and not rest.has_next()
+    shown = [comment.id for comment in [*first_page, *rest]]
+    expected = list(post.comments.order_by('created_at', 'pk')
+                    .values_list('id', flat=True))
+    assert shown == expected, (
+        "Убедитесь, что подгружаемые комментарии продолжают список без"
+        " пропусков и повторов."
+    )
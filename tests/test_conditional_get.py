@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def visible_post(mixer, user, published_category):
+    return mixer.blend('blog.Post', author=user, category=published_category,
+                       pub_date=timezone.now() - timedelta(days=1))
+
+
+def test_post_detail_not_modified(
+        client, mixer, another_user, visible_post,
+        django_assert_num_queries):
+    url = f'/posts/{visible_post.id}/'
+    etag = client.get(url)['ETag']
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что страница поста отвечает 304 на запрос с"
+        " актуальным ETag, не обращаясь к базе данных."
+    )
+    mixer.blend('blog.Comments', post=visible_post, author=another_user)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что новый комментарий меняет ETag страницы поста."
+    )
+
+
+def test_feed_not_modified_until_changed(
+        client, user_client, visible_post):
+    response = client.get('/')
+    assert client.get(
+        '/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+    ).status_code == 304
+    etag = response['ETag']
+    assert client.get('/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert user_client.get('/', HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что ETag ленты зависит от пользователя."
+    )
+    visible_post.is_published = False
+    visible_post.save()
+    assert client.get('/', HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что снятие поста с публикации меняет ETag ленты."
+    )
@@ -0,0 +1,47 @@
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _walk(client, url, cursor_attr):
+    seen = []
+    cursor = ''
+    while True:
+        response = client.get(url, {'cursor': cursor})
+        assert response.status_code == 200
+        page = response.context['page_obj']
+        assert len(page) <= N_PER_PAGE
+        seen.extend(post.id for post in page)
+        cursor = getattr(page, cursor_attr)
+        if cursor is None:
+            return seen, page
+
+
+def test_cursor_pagination_walks_profile(
+        user, user_client, many_posts_with_published_locations):
+    url = f'/profile/{user.username}/'
+    expected = list(user.posts.order_by('-pub_date', '-pk')
+                    .values_list('id', flat=True))
+    forward, last_page = _walk(user_client, url, 'next_cursor')
+    assert forward == expected, (
+        "Убедитесь, что постраничный вывод по курсору показывает все"
+        " публикации по одному разу в порядке убывания даты."
+    )
+    response = user_client.get(
+        url, {'cursor': last_page.previous_cursor})
+    assert [post.id for post in response.context['page_obj']] == (
+        expected[-N_PER_PAGE - len(last_page):-len(last_page)])
+
+
+def test_page_urls_still_work_with_cursor_links(
+        user, user_client, many_posts_with_published_locations):
+    url = f'/profile/{user.username}/'
+    with override_settings(BLOG_CURSOR_PAGINATION=True):
+        response = user_client.get(url)
+        assert '?cursor=' in response.content.decode()
+        response = user_client.get(url, {'page': 2})
+    assert response.context['page_obj'].number == 2
+    assert user_client.get(url, {'cursor': 'broken'}).status_code == 404
@@ -0,0 +1,85 @@
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def exported_post(mixer, user, published_category, published_location):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       location=published_location, title='Выгрузка',
+                       pub_date=timezone.now() - timedelta(days=1))
+    mixer.blend('blog.Comments', post=post, author=user, text='Коммент')
+    return post
+
+
+def test_export_posts_jsonl(tmp_path, exported_post):
+    output = tmp_path / 'posts.jsonl'
+    call_command('export_blog', 'posts', output=str(output))
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert records == [{
+        'id': exported_post.pk,
+        'title': 'Выгрузка',
+        'text': exported_post.text,
+        'pub_date': exported_post.pub_date.isoformat(),
+        'created_at': exported_post.created_at.isoformat(),
+        'is_published': True,
+        'author': exported_post.author.username,
+        'category': exported_post.category.slug,
+        'location': exported_post.location.name,
+        'image': exported_post.image.name,
+    }], (
+        "Убедитесь, что выгрузка публикаций содержит username автора,"
+        " slug категории и название местоположения."
+    )
+
+
+def test_export_since_and_csv(exported_post):
+    later = timezone.now() + timedelta(minutes=1)
+    stdout = StringIO()
+    call_command('export_blog', 'posts', since=later.isoformat(),
+                 stdout=stdout)
+    assert stdout.getvalue() == '', (
+        "Убедитесь, что --since отбирает только изменённые публикации."
+    )
+    stdout = StringIO()
+    call_command('export_blog', 'comments', format='csv', stdout=stdout)
+    rows = list(csv.DictReader(StringIO(stdout.getvalue())))
+    assert [(row['post'], row['text']) for row in rows] == [
+        (str(exported_post.pk), 'Коммент')]
+
+
+def test_export_round_trips_through_import(tmp_path, exported_post):
+    output = tmp_path / 'posts.csv'
+    call_command('export_blog', 'posts', format='csv', output=str(output))
+    Post.objects.all().delete()
+    call_command('import_blog', 'posts', str(output), stdout=StringIO())
+    restored = Post.objects.get(pk=exported_post.pk)
+    assert (restored.title, restored.category_id, restored.location_id) == (
+        exported_post.title, exported_post.category_id,
+        exported_post.location_id)
+    assert restored.is_visible
+
+
+def test_export_endpoint_streams_for_admins(
+        client, user_client, admin_client, exported_post):
+    assert client.get('/export/posts/').status_code == 302
+    assert user_client.get('/export/posts/').status_code == 302
+    response = admin_client.get('/export/posts/', {'format': 'csv'})
+    assert response.status_code == 200
+    assert response.streaming, (
+        "Убедитесь, что выгрузка отдаётся через StreamingHttpResponse."
+    )
+    content = b''.join(response.streaming_content).decode()
+    assert 'Выгрузка' in content
+    assert admin_client.get(
+        '/export/posts/', {'since': 'вчера'}).status_code == 400
+    assert admin_client.get('/export/users/').status_code == 404
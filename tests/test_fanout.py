@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from blog.fanout import inconsistent_posts
+from blog.models import FeedEntry
+
+pytestmark = [pytest.mark.django_db]
+
+
+def entry_keys(post):
+    return set(FeedEntry.objects
+               .filter(post=post)
+               .values_list('kind', 'key'))
+
+
+def test_feed_entries_follow_post_visibility(
+        mixer, user, published_category):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       pub_date=timezone.now() - timedelta(days=1))
+    assert entry_keys(post) == {
+        (FeedEntry.Kind.CATEGORY, published_category.pk),
+        (FeedEntry.Kind.AUTHOR, user.pk),
+    }, "Убедитесь, что видимый пост попадает в ленты категории и автора."
+    post.is_published = False
+    post.save()
+    assert not entry_keys(post), (
+        "Убедитесь, что скрытый пост удаляется из лент."
+    )
+    post.is_published = True
+    post.save()
+    published_category.is_published = False
+    published_category.save()
+    assert not entry_keys(post), (
+        "Убедитесь, что снятие категории с публикации убирает её посты"
+        " из лент."
+    )
+
+
+def test_category_page_is_served_from_feed_entries(
+        client, mixer, user, published_category):
+    mixer.blend('blog.Post', author=user, category=published_category,
+                title='Из ленты',
+                pub_date=timezone.now() - timedelta(days=1))
+    url = f'/category/{published_category.slug}/'
+    assert 'Из ленты' in client.get(url).content.decode()
+    FeedEntry.objects.all().delete()
+    cache.clear()
+    assert 'Из ленты' not in client.get(url).content.decode(), (
+        "Убедитесь, что страница категории строится по таблице FeedEntry."
+    )
+
+
+def test_rebuild_feed_entries_repairs_drift(
+        mixer, user, published_category):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       pub_date=timezone.now() - timedelta(days=1))
+    expected = entry_keys(post)
+    FeedEntry.objects.filter(kind=FeedEntry.Kind.AUTHOR).delete()
+    with pytest.raises(CommandError):
+        call_command('rebuild_feed_entries', check=True)
+    call_command('rebuild_feed_entries')
+    assert entry_keys(post) == expected, (
+        "Убедитесь, что rebuild_feed_entries восстанавливает"
+        " недостающие записи лент."
+    )
+    call_command('rebuild_feed_entries', check=True)
+
+
+def test_inconsistent_posts_finds_every_kind_of_drift(
+        mixer, user, published_category, django_assert_max_num_queries):
+    posts = mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() - timedelta(days=1))
+    hidden = mixer.blend('blog.Post', author=user, is_published=False,
+                         category=published_category,
+                         pub_date=timezone.now() - timedelta(days=1))
+    assert not inconsistent_posts()
+    FeedEntry.objects.filter(post=posts[0],
+                             kind=FeedEntry.Kind.AUTHOR).delete()
+    FeedEntry.objects.filter(post=posts[1],
+                             kind=FeedEntry.Kind.CATEGORY).update(
+        pub_date=timezone.now())
+    FeedEntry.objects.create(kind=FeedEntry.Kind.AUTHOR, key=user.pk,
+                             post=hidden, pub_date=hidden.pub_date)
+    with django_assert_max_num_queries(4):
+        broken = inconsistent_posts()
+    assert broken == {posts[0].pk, posts[1].pk, hidden.pk}, (
+        "Убедитесь, что проверка лент находит недостающие, устаревшие"
+        " и лишние записи."
+    )
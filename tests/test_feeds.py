@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.visibility import refresh_visibility
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_post(mixer, user, published_category):
+    return mixer.blend('blog.Post', author=user, category=published_category,
+                       title='Пост в ленте',
+                       pub_date=timezone.now() - timedelta(days=1))
+
+
+@pytest.mark.parametrize('feed_type', ('rss', 'atom'))
+def test_feeds_list_visible_posts(
+        client, mixer, user, published_category, feed_post, feed_type):
+    mixer.blend('blog.Post', author=user, category=published_category,
+                title='Черновик', is_published=False,
+                pub_date=timezone.now() - timedelta(days=1))
+    for url in (f'/feed/{feed_type}/',
+                f'/category/{published_category.slug}/feed/{feed_type}/',
+                f'/profile/{user.username}/feed/{feed_type}/'):
+        content = client.get(url).content.decode()
+        assert 'Пост в ленте' in content and 'Черновик' not in content, (
+            f"Убедитесь, что лента `{url}` показывает только"
+            " опубликованные посты."
+        )
+    assert client.get('/feed/json/').status_code == 404
+
+
+def test_feed_is_served_from_snapshot(
+        client, feed_post, django_assert_num_queries):
+    response = client.get('/feed/rss/')
+    etag = response['ETag']
+    with django_assert_num_queries(1):
+        response = client.get('/feed/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что лента отвечает 304 на запрос с актуальным ETag."
+    )
+    feed_post.title = 'Новый заголовок'
+    feed_post.save()
+    response = client.get('/feed/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert 'Новый заголовок' in response.content.decode(), (
+        "Убедитесь, что правка поста обновляет снимок ленты."
+    )
+
+
+def test_feed_snapshot_updates_when_scheduled_post_appears(
+        client, mixer, user, published_category, feed_post, monkeypatch):
+    scheduled = mixer.blend('blog.Post', author=user,
+                            category=published_category, title='Отложенный',
+                            pub_date=timezone.now() + timedelta(hours=1))
+    assert 'Отложенный' not in client.get('/feed/atom/').content.decode()
+    later = scheduled.pub_date + timedelta(minutes=1)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    refresh_visibility()
+    assert 'Отложенный' in client.get('/feed/atom/').content.decode(), (
+        "Убедитесь, что снимок ленты перестраивается, когда отложенная"
+        " публикация становится видимой."
+    )
@@ -0,0 +1,100 @@
+from io import BytesIO
+
+import pytest
+from django.core.cache import cache
+from django.core.files.images import ImageFile
+from PIL import Image
+
+from blog import tasks
+from blog.images import get_variant, variant_name
+from blog.models import Task
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_category):
+    img_io = BytesIO()
+    Image.new('RGB', (2000, 1000), color=(73, 109, 137)).save(
+        img_io, format='JPEG')
+    return mixer.blend('blog.Post', author=user, category=published_category,
+                       image=ImageFile(img_io, name='large_image.jpg'))
+
+
+def run_tasks():
+    for job in tasks.claim(100):
+        assert tasks.run(job)
+
+
+def test_image_variants_are_resized(post_with_large_image):
+    run_tasks()
+    card = get_variant(post_with_large_image.image, 'card')
+    assert (card.width, card.height) == (640, 320), (
+        "Убедитесь, что для ленты создаётся уменьшенная копия изображения."
+    )
+    assert card.url.endswith('_card.jpg')
+
+
+def test_variants_of_same_named_files_do_not_collide(
+        mixer, user, published_category):
+    images = {}
+    for name, size, image_format in (('pic.png', (2000, 1000), 'PNG'),
+                                     ('pic.jpg', (1000, 2000), 'JPEG')):
+        img_io = BytesIO()
+        Image.new('RGB', size).save(img_io, format=image_format)
+        post = mixer.blend('blog.Post', author=user,
+                           category=published_category,
+                           image=ImageFile(img_io, name=name))
+        images[name] = post.image
+    run_tasks()
+    images = {name: get_variant(image, 'card')
+              for name, image in images.items()}
+    assert images['pic.png'].url != images['pic.jpg'].url
+    assert (images['pic.png'].width, images['pic.png'].height) == (640, 320)
+    assert (images['pic.jpg'].width, images['pic.jpg'].height) == (320, 640), (
+        "Убедитесь, что копии изображений с одинаковым именем, но разным"
+        " расширением не перезаписывают друг друга."
+    )
+    assert variant_name('a/pic.png', 'card') != variant_name('a/pic.jpg',
+                                                             'card')
+
+
+def test_pages_do_not_resize_images(
+        user_client, user, post_with_large_image):
+    Task.objects.all().delete()
+    cache.clear()
+    content = user_client.get(f'/profile/{user.username}/').content.decode()
+    assert '_card.jpg' not in content, (
+        "Убедитесь, что копии изображений создаёт фоновая задача,"
+        " а не запрос страницы."
+    )
+    assert post_with_large_image.image.url in content
+    assert Task.objects.filter(
+        name__endswith='make_post_image_variants').count() == 1, (
+        "Убедитесь, что страница ставит в очередь создание недостающих"
+        " копий изображения."
+    )
+
+
+def test_feed_uses_card_variant(user_client, user, post_with_large_image):
+    user_client.get(f'/profile/{user.username}/')
+    run_tasks()
+    content = user_client.get(f'/profile/{user.username}/').content.decode()
+    assert '_card.jpg' in content and 'width="640"' in content, (
+        "Убедитесь, что в карточке публикации выводится уменьшенная копия"
+        " изображения с указанием размеров."
+    )
+
+
+def test_card_picks_up_variants_made_by_another_process(
+        user_client, user, post_with_large_image, monkeypatch):
+    user_client.get(f'/profile/{user.username}/')
+    # У воркера свой кэш: сброс версий и страниц сюда не доходит.
+    monkeypatch.setattr(tasks, 'bump_card_version', lambda *args: None)
+    monkeypatch.setattr(tasks, 'purge_pages', lambda *args: None)
+    run_tasks()
+    content = user_client.get(f'/profile/{user.username}/').content.decode()
+    assert '_card.jpg' in content, (
+        "Убедитесь, что карточка обновляется после создания копий"
+        " изображения в другом процессе."
+    )
@@ -0,0 +1,118 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from blog.models import (Category, Comments, FeedEntry, Post, PostTerm,
+                         Task, User)
+from blog.search import search_posts
+
+
+def write_posts(path, now):
+    records = [
+        {'id': 101, 'title': 'Импорт', 'text': 'первый пост',
+         'author': 'importer', 'category': 'imported', 'location': 'Москва',
+         'pub_date': (now - timedelta(days=1)).isoformat()},
+        {'id': 102, 'title': 'Черновик', 'text': 'второй пост',
+         'author': 'importer', 'category': 'imported',
+         'is_published': False,
+         'pub_date': (now - timedelta(days=1)).isoformat()},
+        {'title': 'Отложенный', 'text': 'третий пост',
+         'author': 'someone', 'category': 'imported',
+         'pub_date': (now + timedelta(days=1)).isoformat()},
+    ]
+    path.write_text('\n'.join(json.dumps(record, ensure_ascii=False)
+                              for record in records))
+
+
+def write_comments(path):
+    path.write_text('post,author,text,created_at\n'
+                    '101,reader,Отлично,2020-01-01T10:00:00\n'
+                    '101,importer,Спасибо,\n'
+                    '102,reader,Жаль,\n')
+
+
+def assert_imported():
+    assert Post.objects.count() == 3
+    assert Category.objects.get(slug='imported').is_published
+    assert User.objects.filter(username__in=('importer', 'someone',
+                                             'reader')).count() == 3
+    assert set(Post.objects.filter(is_visible=True)
+               .values_list('pk', flat=True)) == {101}, (
+        "Убедитесь, что импорт вычисляет видимость публикаций."
+    )
+    assert FeedEntry.objects.filter(post_id=101).count() == 2, (
+        "Убедитесь, что импорт заполняет ленты категорий и авторов."
+    )
+    assert list(search_posts('импорт')) == [Post.objects.get(pk=101)], (
+        "Убедитесь, что импорт индексирует публикации для поиска."
+    )
+    assert Post.objects.get(pk=101).comment_count == 2, (
+        "Убедитесь, что импорт обновляет счётчики комментариев."
+    )
+    assert Comments.objects.filter(
+        created_at__year=2020).count() == 1, (
+        "Убедитесь, что дата комментария берётся из файла."
+    )
+
+
+@pytest.mark.django_db
+def test_import_posts_and_comments(tmp_path):
+    write_posts(tmp_path / 'posts.jsonl', timezone.now())
+    write_comments(tmp_path / 'comments.csv')
+    call_command('import_blog', 'posts', str(tmp_path / 'posts.jsonl'),
+                 batch_size=2, stdout=StringIO())
+    call_command('import_blog', 'comments', str(tmp_path / 'comments.csv'),
+                 batch_size=2, stdout=StringIO())
+    assert_imported()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_with_deferred_rebuild(tmp_path):
+    write_posts(tmp_path / 'posts.jsonl', timezone.now())
+    write_comments(tmp_path / 'comments.csv')
+    for kind, name in (('posts', 'posts.jsonl'),
+                       ('comments', 'comments.csv')):
+        call_command('import_blog', kind, str(tmp_path / name),
+                     rebuild=True, drop_indexes=True, stdout=StringIO())
+    assert_imported()
+    assert PostTerm.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_rejects_unknown_post(tmp_path):
+    (tmp_path / 'comments.jsonl').write_text(
+        '{"post": 999, "author": "reader", "text": "Кому?"}\n')
+    with pytest.raises(CommandError):
+        call_command('import_blog', 'comments',
+                     str(tmp_path / 'comments.jsonl'), stdout=StringIO())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('rebuild', (False, True))
+def test_import_refreshes_cards_and_schedules_publication(
+        tmp_path, client, rebuild):
+    cache.clear()
+    now = timezone.now()
+    write_posts(tmp_path / 'posts.jsonl', now)
+    write_comments(tmp_path / 'comments.csv')
+    call_command('import_blog', 'posts', str(tmp_path / 'posts.jsonl'),
+                 rebuild=rebuild, stdout=StringIO())
+    deferred = Post.objects.get(title='Отложенный')
+    job = Task.objects.get(name__endswith='refresh_post_visibility')
+    assert job.args == [deferred.pk], (
+        "Убедитесь, что импорт ставит пересчёт видимости отложенным"
+        " постам."
+    )
+    assert abs(job.run_after - deferred.pub_date) < timedelta(minutes=1)
+    assert 'Комментарии (0)' in client.get('/').content.decode()
+    call_command('import_blog', 'comments', str(tmp_path / 'comments.csv'),
+                 rebuild=rebuild, stdout=StringIO())
+    assert 'Комментарии (2)' in client.get('/').content.decode(), (
+        "Убедитесь, что карточки показывают число загруженных"
+        " комментариев."
+    )
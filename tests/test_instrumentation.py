@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.instrumentation import (QueryBudgetExceeded, RequestMetrics,
+                                  reset_stats, view_stats)
+from blog.models import User
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_server_timing_and_stats(client, mixer, user, published_category):
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=timezone.now() - timedelta(days=1))
+    reset_stats()
+    response = client.get('/')
+    timing = response['Server-Timing']
+    for metric in ('db;dur=', 'tpl;dur=', 'total;dur='):
+        assert metric in timing, (
+            f"Убедитесь, что заголовок Server-Timing содержит {metric}"
+        )
+    stats = view_stats()['blog:index']
+    assert stats['requests'] == 1
+    assert stats['max_queries'] > 0
+    assert stats['avg_template_ms'] > 0, (
+        "Убедитесь, что время отрисовки шаблонов учитывается."
+    )
+
+
+def test_query_budget(client, mixer, user, published_category):
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=timezone.now() - timedelta(days=1))
+    with override_settings(BLOG_QUERY_BUDGETS={'blog:index': 0}):
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/')
+        with override_settings(BLOG_QUERY_BUDGET_STRICT=False):
+            assert client.get('/').status_code == 200, (
+                "Убедитесь, что вне тестов превышение бюджета только"
+                " записывается в лог."
+            )
+
+
+def test_duplicate_selects_are_flagged(user):
+    with RequestMetrics() as metrics:
+        for _ in range(3):
+            User.objects.filter(pk=user.pk).first()
+        User.objects.count()
+    assert list(metrics.duplicates().values()) == [3], (
+        "Убедитесь, что повторяющиеся запросы (N+1) обнаруживаются."
+    )
+
+
+def test_stats_page_is_staff_only(client, admin_client):
+    assert client.get('/stats/').status_code == 302
+    response = admin_client.get('/stats/')
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/json'
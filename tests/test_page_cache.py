@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import cache as blog_cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_index_is_cached_and_purged(
+        client, mixer, user, published_category, django_assert_num_queries):
+    mixer.blend('blog.Post', author=user, category=published_category,
+                title='Первый пост',
+                pub_date=timezone.now() - timedelta(days=1))
+    assert 'Первый пост' in client.get('/').content.decode()
+    with django_assert_num_queries(0):
+        client.get('/')
+    mixer.blend('blog.Post', author=user, category=published_category,
+                title='Второй пост',
+                pub_date=timezone.now() - timedelta(days=1))
+    assert 'Второй пост' in client.get('/').content.decode(), (
+        "Убедитесь, что новая публикация сбрасывает кэш главной страницы."
+    )
+
+
+
+def test_page_cache_expires_at_next_pub_date(
+        client, mixer, user, published_category, monkeypatch):
+    timeouts = []
+    monkeypatch.setattr(
+        blog_cache.cache, 'set',
+        lambda key, value, timeout=None, **kwargs: timeouts.append(timeout))
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=timezone.now() + timedelta(seconds=30))
+    timeouts.clear()
+    client.get(f'/category/{published_category.slug}/')
+    assert timeouts and 0 < timeouts[-1] <= 30, (
+        "Убедитесь, что кэш страницы не переживает ближайшую отложенную"
+        " публикацию."
+    )
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import paginators
+from blog.models import Post
+from blog.paginators import CachedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return [query['sql'] for query in queries
+            if 'COUNT(' in query['sql'].upper()]
+
+
+def test_feed_count_is_lean_and_cached(
+        user_client, mixer, user, published_category):
+    mixer.cycle(11).blend('blog.Post', author=user,
+                          category=published_category,
+                          pub_date=timezone.now() - timedelta(days=1))
+    counts = _count_queries(user_client, '/')
+    assert len(counts) == 1 and 'auth_user' not in counts[0], (
+        "Убедитесь, что общее число постов считается без лишних JOIN."
+    )
+    assert not _count_queries(user_client, '/?page=2'), (
+        "Убедитесь, что число постов в ленте кэшируется."
+    )
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=timezone.now() - timedelta(days=1))
+    response = user_client.get('/?page=2')
+    assert response.context['paginator'].count == 12, (
+        "Убедитесь, что новая публикация сбрасывает кэш числа постов."
+    )
+
+
+def test_estimated_count_above_threshold(
+        settings, monkeypatch, mixer, user, published_category):
+    mixer.cycle(5).blend('blog.Post', author=user,
+                         category=published_category)
+    settings.BLOG_PAGINATOR_ESTIMATE_THRESHOLD = 10
+    assert CachedCountPaginator(Post.objects.all(), 2).count == 5
+    settings.BLOG_PAGINATOR_ESTIMATE_THRESHOLD = 3
+    monkeypatch.setattr(paginators, 'planner_estimate',
+                        lambda queryset: 1000)
+    assert CachedCountPaginator(Post.objects.filter(pk__gt=0), 2).count == (
+        1000), (
+        "Убедитесь, что выше порога используется оценка числа строк."
+    )
@@ -0,0 +1,23 @@
+import pytest
+
+from blog.cache import card_version
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_cache_follows_related_models(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    version = card_version(post)
+    assert card_version(post) == version, (
+        "Убедитесь, что версия карточки поста не меняется без изменений."
+    )
+    location = post.location
+    location.name = 'Переименованное место'
+    location.save()
+    assert card_version(post) != version, (
+        "Убедитесь, что изменение местоположения сбрасывает кэш карточек"
+        " его публикаций."
+    )
+    response = user_client.get(f'/profile/{post.author.username}/')
+    assert 'Переименованное место' in response.content.decode()
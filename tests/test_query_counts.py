@@ -0,0 +1,69 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context)
+
+
+def test_post_detail_query_count_is_constant(
+        mixer, user_client, another_user, post_with_published_location):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    mixer.blend('blog.Comments', post=post, author=another_user)
+    few = _count_queries(user_client, url)
+    mixer.cycle(20).blend('blog.Comments', post=post,
+                          author=mixer.SELECT)
+    many = _count_queries(user_client, url)
+    assert few == many, (
+        "Убедитесь, что число запросов к базе на странице поста не зависит"
+        " от количества комментариев."
+    )
+
+
+def _fetches(queries, table):
+    return [query['sql'] for query in queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{table}"' in query['sql']]
+
+
+@pytest.mark.parametrize('action', ['edit', 'delete'])
+def test_post_edit_views_fetch_post_once(
+        user_client, post_with_published_location, action):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(f'/posts/{post.id}/{action}/')
+    assert response.status_code == 200
+    fetches = _fetches(context.captured_queries, 'blog_post')
+    assert len(fetches) == 1, (
+        "Убедитесь, что редактируемая публикация загружается из базы"
+        " один раз за запрос."
+    )
+    assert 'JOIN "auth_user"' in fetches[0], (
+        "Убедитесь, что автор публикации загружается вместе с ней."
+    )
+
+
+@pytest.mark.parametrize('action', ['edit_comment', 'delete_comment'])
+def test_comment_edit_views_fetch_comment_once(
+        mixer, user, user_client, post_with_published_location, action):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comments', post=post, author=user)
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(f'/posts/{post.id}/{action}/{comment.id}/')
+    assert response.status_code == 200
+    queries = context.captured_queries
+    fetches = _fetches(queries, 'blog_comments')
+    assert len(fetches) == 1, (
+        "Убедитесь, что комментарий загружается из базы один раз за запрос."
+    )
+    assert 'JOIN "auth_user"' in fetches[0]
+    assert not _fetches(queries, 'blog_post'), (
+        "Убедитесь, что публикация комментария загружается вместе с ним."
+    )
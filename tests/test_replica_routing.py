@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(db, tmp_path, settings):
+    """Вторая SQLite-база в файле вместо реплики."""
+    connections.databases[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    connections.ensure_defaults(REPLICA)
+    connections.prepare_test_settings(REPLICA)
+    settings.BLOG_DATABASE_REPLICAS = [REPLICA]
+    cache.clear()
+    try:
+        call_command('migrate', database=REPLICA, verbosity=0)
+        yield connections[REPLICA]
+    finally:
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+
+
+def _queries(client, url):
+    with CaptureQueriesContext(connection) as primary, \
+            CaptureQueriesContext(connections[REPLICA]) as replica:
+        response = client.get(url)
+    return response, len(primary), len(replica)
+
+
+def test_read_views_use_replica(client, replica):
+    for url in ('/', '/pages/about/'):
+        response, primary, replica_queries = _queries(client, url)
+        assert response.status_code == 200
+        assert primary == 0 and (url != '/' or replica_queries), (
+            f"Убедитесь, что страница `{url}` читает данные с реплики."
+        )
+
+
+def test_writes_stick_to_primary(
+        user_client, mixer, user, published_category, replica):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       pub_date=timezone.now() - timedelta(days=1))
+    response, primary, replica_queries = _queries(
+        user_client, f'/posts/{post.id}/')
+    assert response.status_code == 404 and replica_queries, (
+        "Убедитесь, что без недавних изменений пост читается с реплики."
+    )
+    user_client.post(f'/posts/{post.id}/comment/', {'text': 'Новый'})
+    response, primary, replica_queries = _queries(
+        user_client, f'/posts/{post.id}/')
+    assert response.status_code == 200 and not replica_queries, (
+        "Убедитесь, что после записи пользователь читает с основной базы."
+    )
+    assert 'Новый' in response.content.decode()
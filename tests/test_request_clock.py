@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import middleware, tasks
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduled_post_appears_without_restart(
+        user_client, mixer, user, published_category, monkeypatch):
+    user_client.get('/')
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       pub_date=timezone.now() + timedelta(hours=1))
+    assert post not in user_client.get('/').context['page_obj']
+    real_now = timezone.now
+    monkeypatch.setattr(middleware.timezone, 'now',
+                        lambda: real_now() + timedelta(hours=2))
+    for job in tasks.claim(10):
+        tasks.run(job)
+    assert post in user_client.get('/').context['page_obj'], (
+        "Убедитесь, что отложенные публикации появляются на главной"
+        " странице без перезапуска сервера."
+    )
+
+
+def test_request_clock_is_rounded(rf, settings):
+    settings.BLOG_CLOCK_GRANULARITY = 60
+    request = rf.get('/')
+    now = middleware.request_now(request)
+    assert now.second == 0 and now.microsecond == 0
+    assert middleware.request_now(request) is now
+
+
+def test_zero_granularity_turns_rounding_off(rf, settings):
+    settings.BLOG_CLOCK_GRANULARITY = 0
+    before = timezone.now()
+    now = middleware.request_now(rf.get('/'))
+    assert before <= now <= timezone.now(), (
+        "Убедитесь, что при BLOG_CLOCK_GRANULARITY = 0 время запроса"
+        " не округляется."
+    )
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _titles(response):
+    return [post.title for post in response.context['page_obj']]
+
+
+def test_search_ranks_title_matches_first(
+        client, mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=past, title='Заметки', text='Про ёжика в тумане')
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=past, title='Ежик', text='Туман над рекой')
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=past, title='Другое', text='Только ежик')
+    response = client.get('/search/', {'q': 'Ёжик туман'})
+    assert _titles(response) == ['Ежик'], (
+        "Убедитесь, что поиск находит публикации со всеми словами запроса."
+    )
+    response = client.get('/search/', {'q': 'ежик'})
+    assert _titles(response)[0] == 'Ежик', (
+        "Убедитесь, что совпадения в заголовке ранжируются выше."
+    )
+
+
+def test_search_respects_visibility_and_updates(
+        client, mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+    hidden = mixer.blend('blog.Post', author=user, is_published=False,
+                         category=published_category, pub_date=past,
+                         title='Черновик', text='секретное слово')
+    assert not _titles(client.get('/search/', {'q': 'секретное'})), (
+        "Убедитесь, что поиск не показывает снятые с публикации посты."
+    )
+    hidden.is_published = True
+    hidden.text = 'новое слово'
+    hidden.save()
+    assert not _titles(client.get('/search/', {'q': 'секретное'}))
+    assert _titles(client.get('/search/', {'q': 'новое'})) == ['Черновик'], (
+        "Убедитесь, что поисковый индекс обновляется при сохранении поста."
+    )
+
+
+def test_admin_search_by_text_and_related_fields(
+        admin_client, mixer, user, published_category, published_location):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       location=published_location, title='Зимний лес',
+                       pub_date=timezone.now() - timedelta(days=1))
+    other = mixer.blend('blog.Post', author=mixer.blend('auth.User'),
+                        title='Летний луг',
+                        pub_date=timezone.now() - timedelta(days=1))
+    for query in ('зимний', user.username, published_category.slug,
+                  published_location.name):
+        response = admin_client.get('/admin/blog/post/', {'q': query})
+        found = list(response.context['cl'].result_list)
+        assert found == [post], (
+            "Убедитесь, что поиск в админке находит публикации по тексту,"
+            f" автору, категории и местоположению (запрос {query!r})."
+        )
+    assert other not in response.context['cl'].result_list
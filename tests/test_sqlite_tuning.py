@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 100,
+}
+
+
+@pytest.fixture
+def connect(tmp_path, django_db_blocker):
+    """Открывает независимые соединения к одному файлу SQLite."""
+    opened = []
+
+    def connect():
+        wrapper = DatabaseWrapper({**connection.settings_dict,
+                                   'NAME': str(tmp_path / 'db.sqlite3'),
+                                   'OPTIONS': {'timeout': 0.1}})
+        wrapper.ensure_connection()
+        opened.append(wrapper)
+        return wrapper.connection
+
+    with django_db_blocker.unblock():
+        yield connect
+        for wrapper in opened:
+            wrapper.close()
+
+
+def _write_during_read(connect):
+    reader, writer = connect(), connect()
+    writer.execute('CREATE TABLE IF NOT EXISTS comments (text)')
+    reader.execute('BEGIN')
+    reader.execute('SELECT count(*) FROM comments').fetchone()
+    writer.execute('INSERT INTO comments VALUES (?)', ('Комментарий',))
+    reader.execute('COMMIT')
+
+
+def test_sqlite_pragmas_applied(settings, connect):
+    settings.BLOG_SQLITE_PRAGMAS = PRAGMAS
+    sqlite = connect()
+    assert sqlite.execute('PRAGMA journal_mode').fetchone()[0] == 'wal', (
+        "Убедитесь, что новые соединения SQLite включают режим WAL."
+    )
+    assert sqlite.execute('PRAGMA synchronous').fetchone()[0] == 1
+    assert sqlite.execute('PRAGMA busy_timeout').fetchone()[0] == 100
+
+
+def test_wal_write_does_not_wait_for_readers(settings, connect):
+    settings.BLOG_SQLITE_PRAGMAS = PRAGMAS
+    _write_during_read(connect)
+
+
+def test_rollback_journal_write_waits_for_readers(settings, connect):
+    settings.BLOG_SQLITE_PRAGMAS = {}
+    with pytest.raises(sqlite3.OperationalError, match='locked'):
+        _write_during_read(connect)
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Task
+from blog.tasks import claim, enqueue, run
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_failed_task_is_retried_with_backoff(settings):
+    settings.BLOG_TASK_MAX_ATTEMPTS = 2
+    enqueue('builtins.int', 'not a number')
+    [job] = claim(10)
+    assert claim(10) == [], (
+        "Убедитесь, что взятая в работу задача не выдаётся повторно."
+    )
+    assert not run(job)
+    job.refresh_from_db()
+    assert job.status == Task.Status.PENDING
+    assert job.run_after > timezone.now() + timedelta(
+        seconds=settings.BLOG_TASK_RETRY_DELAY - 1)
+    Task.objects.update(run_after=timezone.now())
+    [job] = claim(10)
+    assert not run(job)
+    job.refresh_from_db()
+    assert job.status == Task.Status.FAILED and 'ValueError' in (
+        job.last_error)
+
+
+def test_successful_task_is_removed():
+    enqueue('builtins.int', '42')
+    [job] = claim(10)
+    assert run(job)
+    assert not Task.objects.exists()
+
+
+def test_emails_are_sent_from_the_queue():
+    with override_settings(
+            EMAIL_BACKEND='blog.mail.QueuedEmailBackend',
+            BLOG_TASK_EMAIL_BACKEND=(
+                'django.core.mail.backends.locmem.EmailBackend')):
+        mail.send_mail('Тема', 'Текст', 'from@example.com',
+                       ['to@example.com'])
+        assert not mail.outbox, (
+            "Убедитесь, что письма не отправляются во время запроса."
+        )
+        for job in claim(10):
+            assert run(job)
+    assert [message.subject for message in mail.outbox] == ['Тема']
+
+
+def test_queued_emails_keep_attachments():
+    with override_settings(
+            EMAIL_BACKEND='blog.mail.QueuedEmailBackend',
+            BLOG_TASK_EMAIL_BACKEND=(
+                'django.core.mail.backends.locmem.EmailBackend')):
+        message = mail.EmailMessage('Тема', 'Текст', 'from@example.com',
+                                    ['to@example.com'])
+        message.attach('report.csv', 'a,b\n1,2\n', 'text/csv')
+        message.attach('logo.png', b'\x89PNG\x00\xff', 'image/png')
+        message.send()
+        for job in claim(10):
+            assert run(job)
+    [sent] = mail.outbox
+    assert sent.attachments == [
+        ('report.csv', 'a,b\n1,2\n', 'text/csv'),
+        ('logo.png', b'\x89PNG\x00\xff', 'image/png'),
+    ], "Убедитесь, что письма из очереди отправляются с вложениями."
+
+
+def test_abandoned_task_counts_as_attempt(settings):
+    settings.BLOG_TASK_MAX_ATTEMPTS = 2
+    enqueue('builtins.int', '42')
+    stale = timezone.now() - timedelta(
+        seconds=settings.BLOG_TASK_LOCK_TIMEOUT + 1)
+    for attempts in (1, 2):
+        claim(10)
+        Task.objects.update(locked_at=stale)
+        claim(0)
+        job = Task.objects.get()
+        assert job.attempts == attempts
+    assert job.status == Task.Status.FAILED, (
+        "Убедитесь, что задача, на которой падает воркер, не повторяется"
+        " больше BLOG_TASK_MAX_ATTEMPTS раз."
+    )
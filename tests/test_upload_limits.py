@@ -0,0 +1,43 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _post_with_image(user_client, category, size):
+    img_io = BytesIO()
+    Image.new('RGB', size, color=(73, 109, 137)).save(img_io, format='PNG')
+    return user_client.post('/posts/create/', {
+        'title': 'Пост с картинкой',
+        'text': 'Текст',
+        'pub_date': timezone.now().strftime('%Y-%m-%dT%H:%M'),
+        'category': category.id,
+        'image': SimpleUploadedFile('photo.png', img_io.getvalue(),
+                                    content_type='image/png'),
+    })
+
+
+@pytest.mark.parametrize('limit', [
+    {'BLOG_MAX_IMAGE_SIZE': 100},
+    {'BLOG_MAX_IMAGE_PIXELS': 100 * 100},
+])
+def test_large_images_are_rejected(
+        settings, user_client, published_category, limit):
+    for name, value in limit.items():
+        setattr(settings, name, value)
+    response = _post_with_image(user_client, published_category, (200, 200))
+    assert response.status_code == 200 and not Post.objects.exists(), (
+        "Убедитесь, что слишком большие изображения отклоняются формой."
+    )
+    assert response.context['form'].has_error('image')
+
+
+def test_images_within_limits_are_accepted(user_client, published_category):
+    _post_with_image(user_client, published_category, (200, 200))
+    assert Post.objects.filter(image__endswith='.png').exists()
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog import tasks, visibility
+from blog.models import Post, Task
+from blog.visibility import refresh_visibility
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduled_post_appears_when_task_runs(
+        client, mixer, user, published_category, monkeypatch):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       title='Отложенный',
+                       pub_date=timezone.now() + timedelta(hours=1))
+    assert not post.is_visible
+    assert 'Отложенный' not in client.get('/').content.decode()
+    job = Task.objects.get(name__endswith='refresh_post_visibility')
+    assert job.run_after >= post.pub_date - timedelta(seconds=1), (
+        "Убедитесь, что пересчёт видимости запланирован на дату публикации."
+    )
+    later = post.pub_date + timedelta(seconds=1)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    assert tasks.run(job)
+    post.refresh_from_db()
+    assert post.is_visible
+    assert 'Отложенный' in client.get('/').content.decode(), (
+        "Убедитесь, что появление отложенного поста сбрасывает кэш ленты."
+    )
+
+
+def test_category_toggle_updates_visibility(
+        mixer, user, published_category):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       pub_date=timezone.now() - timedelta(days=1))
+    assert Post.objects.get(pk=post.pk).is_visible
+    published_category.is_published = False
+    published_category.save()
+    assert not Post.objects.get(pk=post.pk).is_visible, (
+        "Убедитесь, что снятие категории с публикации скрывает её посты."
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert Post.objects.get(pk=post.pk).is_visible
+    published_category.delete()
+    assert not Post.objects.get(pk=post.pk).is_visible, (
+        "Убедитесь, что посты удалённой категории скрываются."
+    )
+    assert refresh_visibility() == 0
+
+
+def test_list_etag_follows_flip_in_another_process(
+        client, mixer, user, published_category, monkeypatch):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       pub_date=timezone.now() + timedelta(hours=1))
+    urls = ('/', f'/category/{published_category.slug}/',
+            f'/profile/{user.username}/')
+    etags = {url: client.get(url)['ETag'] for url in urls}
+    # У воркера свой кэш: сброс страниц сюда не доходит.
+    monkeypatch.setattr(visibility, 'purge_pages', lambda *scopes: None)
+    monkeypatch.setattr(visibility, 'expire_feeds', lambda *scopes: None)
+    later = post.pub_date + timedelta(seconds=1)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    assert tasks.run(Task.objects.get(
+        name__endswith='refresh_post_visibility'))
+    for url, etag in etags.items():
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            "Убедитесь, что ETag ленты меняется, когда отложенный пост"
+            f" публикует другой процесс: {url}"
+        )
+
+
+def test_repeated_saves_schedule_one_refresh(
+        mixer, user, published_category):
+    cache.clear()
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       pub_date=timezone.now() + timedelta(hours=1))
+    post.title = 'Правка'
+    post.save()
+    post.save()
+    jobs = Task.objects.filter(name__endswith='refresh_post_visibility')
+    assert jobs.count() == 1, (
+        "Убедитесь, что повторные сохранения отложенного поста не ставят"
+        " в очередь лишние задачи пересчёта видимости."
+    )
+    post.pub_date += timedelta(hours=1)
+    post.save()
+    assert jobs.count() == 2, (
+        "Убедитесь, что перенос даты публикации ставит новую задачу."
+    )